@@ -1,6 +1,7 @@
 import asyncio
-import json
+import logging
 import os
+import orjson
 import bs4
 import re
 from pathlib import Path
@@ -13,6 +14,40 @@ from x_client_transaction import ClientTransaction
 from x_client_transaction.utils import get_ondemand_file_url
 import sys
 
+log = logging.getLogger(__name__)
+
+# The key-byte index expressions ClientTransaction looks for in ondemand.s
+_ONDEMAND_INDICES_RE = re.compile(r"\(\w\[(\d{1,2})\],\s*16\)")
+
+# Host part of an absolute URL, for filtering captured browser requests
+# without a full urlparse per request
+_HOST_RE = re.compile(r"^[A-Za-z][\w+.-]*://(?:[^@/\s]+@)?([^/:?#\s]+)")
+
+# Lightweight authenticated endpoint used to validate saved credentials
+_BADGE_COUNT_URL = "https://x.com/i/api/2/badge_count/badge_count.json?supports_ntab_urt=1"
+_BADGE_COUNT_PATH = urlparse(_BADGE_COUNT_URL).path
+
+def _read_json_file(path: Path) -> Any:
+    """Parse a JSON file straight from its bytes"""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+def _write_json_file(path: Path, data: Any) -> None:
+    """Write data as indented JSON, keeping the saved files human-readable"""
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+def _ondemand_text(ondemand_js: str) -> str:
+    """Get the ondemand.s source in the form ClientTransaction reads it
+    
+    The file is JavaScript, so when the index expressions are found in the raw
+    text it is used directly instead of being run through an HTML parser. An
+    HTML-wrapped copy falls back to extracting its text with BeautifulSoup.
+    """
+    if _ONDEMAND_INDICES_RE.search(ondemand_js):
+        return ondemand_js
+    return bs4.BeautifulSoup(ondemand_js, 'html.parser').text
+
 class XAuthenticator:
     def __init__(self, 
                  data_dir: str = None, 
@@ -50,6 +85,12 @@ class XAuthenticator:
         # Ensure data directory exists
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
+        # In-memory caches so repeated getter calls don't go back to disk
+        self._cookies_dict = None
+        self._cookie_header = None
+        self._ct0_token = None
+        self._public_transaction_data = None
+        
         # Data storage
         self.cookies = None
         self.headers = []
@@ -60,6 +101,48 @@ class XAuthenticator:
         self.auth_token = None
         self.csrf_token = None
         
+        # Shared HTTP session for validating saved credentials (created on first use)
+        self._validation_session = None
+        self._validation_headers_source = None
+        self._validation_cookies_source = None
+        
+        # Playwright driver and browser kept warm between interactive logins
+        self._playwright = None
+        self._browser = None
+        
+    @property
+    def cookies(self) -> Optional[List[Dict[str, Any]]]:
+        """Cookies captured from the browser session"""
+        return self._cookies
+        
+    @cookies.setter
+    def cookies(self, value: Optional[List[Dict[str, Any]]]) -> None:
+        # Anything derived from the previous cookies is now stale
+        self._cookies = value
+        self._cookies_dict = None
+        self._cookie_header = None
+        self._ct0_token = None
+        
+    @property
+    def cookie_header(self) -> str:
+        """Cookie header value for the current cookies, built once per cookie set"""
+        if self._cookie_header is None:
+            self._build_cookie_header()
+        return self._cookie_header
+        
+    @property
+    def ct0_token(self) -> Optional[str]:
+        """The ct0 (CSRF) token from the current cookies"""
+        if self._cookie_header is None:
+            self._build_cookie_header()
+        return self._ct0_token
+        
+    def _build_cookie_header(self) -> None:
+        """Build and cache the Cookie header value and ct0 token"""
+        cookies_dict = self.get_cookies_dict()
+        self._cookie_header = "; ".join(f"{name}={value}" for name, value in cookies_dict.items())
+        self._ct0_token = cookies_dict.get('ct0')
+        
     async def login(self, force_login: bool = False) -> bool:
         """
         Launch browser and handle X login
@@ -70,117 +153,183 @@ class XAuthenticator:
         Returns:
             bool: Whether login was successful
         """
-        sys.stderr.write(f"Current working directory: {os.getcwd()}\n")
-        sys.stderr.write("Checking for files:\n")
-        sys.stderr.write(f"Cookies: {self.cookies_path} {self.cookies_path.exists()}\n")
-        sys.stderr.write(f"Common headers: {self.common_headers_path} {self.common_headers_path.exists()}\n")
-        sys.stderr.write(f"Home HTML: {self.home_path} {self.home_path.exists()}\n")
-        sys.stderr.write(f"Ondemand JS: {self.ondemand_path} {self.ondemand_path.exists()}\n")
+        # List the data directory once instead of stat-ing each file
+        try:
+            with os.scandir(self.data_dir) as it:
+                entries = {entry.name for entry in it}
+        except FileNotFoundError:
+            entries = set()
+        has_cookies = self.cookies_path.name in entries
+        has_common_headers = self.common_headers_path.name in entries
+        has_home = self.home_path.name in entries
+        has_ondemand = self.ondemand_path.name in entries
+        
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Current working directory: %s", os.getcwd())
+            log.debug("Checking for files:")
+            log.debug("Cookies: %s %s", self.cookies_path, has_cookies)
+            log.debug("Common headers: %s %s", self.common_headers_path, has_common_headers)
+            log.debug("Home HTML: %s %s", self.home_path, has_home)
+            log.debug("Ondemand JS: %s %s", self.ondemand_path, has_ondemand)
         
         if not force_login:
             # Check if all required files exist
-            if (self.cookies_path.exists() and 
-                self.common_headers_path.exists() and 
-                self.home_path.exists() and 
-                self.ondemand_path.exists()):
+            if has_cookies and has_common_headers and has_home and has_ondemand:
                 
                 # Load existing data
                 self._load_saved_data()
                 sys.stderr.write(f"Loaded existing authentication data from {self.data_dir}\n")
-                # Test if authentication is still valid
-                test_session = requests.Session()
-                test_session.headers.update(self.common_headers)
-                for name, value in self.get_cookies_dict().items():
-                    test_session.cookies.set(name, value, domain='.twitter.com')
-                test_url = "https://x.com/i/api/2/badge_count/badge_count.json?supports_ntab_urt=1"
-                try:
-                    transaction_id = None
-                    try:
-                        home_html, ondemand_js = self.get_transaction_generator_data()
-                        if home_html and ondemand_js:
-                            home_soup = bs4.BeautifulSoup(home_html, 'html.parser')
-                            ondemand_soup = bs4.BeautifulSoup(ondemand_js, 'html.parser')
-                            ct = ClientTransaction(home_page_response=home_soup, ondemand_file_response=ondemand_soup)
-                            test_path = urlparse(test_url).path
-                            transaction_id = ct.generate_transaction_id(method="GET", path=test_path)
-                            sys.stderr.write(f"Generated transaction ID: {transaction_id}\n")
-                    except Exception as e:
-                        sys.stderr.write(f"Could not generate transaction ID for debug: {str(e)}\n")
-                    if transaction_id:
-                        test_session.headers["x-client-transaction-id"] = transaction_id
-                    sys.stderr.write(f"Request headers: {dict(test_session.headers)}\n")
-                    sys.stderr.write(f"Request cookies: {test_session.cookies.get_dict()}\n")
-                    response = test_session.get(test_url)
-                    if response.status_code == 200:
-                        sys.stderr.write("Authentication test SUCCESSFUL! You are still logged in.\n")
-                        sys.stderr.write(f"JSON response preview: {response.text[:100]}...\n")
-                        # After checking/using saved data, always fetch public home/ondemand (outside Playwright)
-                        self.fetch_public_home_and_ondemand()
-                        return True
-                    else:
-                        sys.stderr.write(f"Authentication test FAILED. Status code: {response.status_code}\n")
-                        sys.stderr.write(f"Response: {response.text}\n")
-                        sys.stderr.write("Your cookies/headers are no longer valid. Please re-run with force_login=True or delete the data files to log in again.\n")
-                        return False
-                except Exception as e:
-                    sys.stderr.write(f"Error during authentication test: {str(e)}\n")
-                    sys.stderr.write("Please re-run with force_login=True or delete the data files to log in again.\n")
-                    return False
+                # Test if authentication is still valid, off the event loop
+                return await asyncio.to_thread(self._validate_saved_cookies)
             
-        # Start browser for manual login
-        sys.stderr.write("Starting browser for X login...\n")
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
+        # The public home/ondemand files don't depend on the login, so fetch them
+        # in the background while the browser launches and the user logs in
+        public_data_task = asyncio.create_task(asyncio.to_thread(self.fetch_public_home_and_ondemand))
+        
+        logged_in = False
+        try:
+            # Start browser for manual login
+            sys.stderr.write("Starting browser for X login...\n")
+            browser = await self._get_browser()
             context = await browser.new_context()
-            page = await context.new_page()
+            try:
+                page = await context.new_page()
 
-            # Monitor all requests (for headers/cookies only)
-            captured_headers = []
-            seen_headers = set()
-            async def on_request(request):
-                parsed = urlparse(request.url)
-                if parsed.hostname and ("x.com" in parsed.hostname or "twitter.com" in parsed.hostname):
-                    header_tuple = tuple(sorted(request.headers.items()))
-                    if header_tuple not in seen_headers:
-                        seen_headers.add(header_tuple)
-                        captured_headers.append({"url": request.url, "headers": dict(request.headers)})
-                        sys.stderr.write(f"Captured headers for: {request.url}\n")
-            
-            page.on("request", on_request)
-            
-            # Go to login page (for login only)
-            await page.goto("https://x.com/login")
-            sys.stderr.write("\nPlease log in manually in the browser window (including 2FA if needed).\n")
-            input("Press Enter here after you have completed login and see your home feed...")
-            
-            sys.stderr.write("\nNow browse and interact with X to generate various requests.\n")
-            sys.stderr.write("Try different actions like refreshing pages, viewing profiles, etc.\n")
-            input("Press Enter when you're done...\n")
-            
-            # Save cookies and headers only
-            self.cookies = await context.cookies()
-            self.headers = captured_headers
-            
-            sys.stderr.write("Processing captured data...\n")
-            
-            self._extract_tokens_from_cookies()
-            self._process_common_headers()
-            
-            with open(self.headers_path, "w") as f:
-                json.dump(self.headers, f, indent=2)
-            sys.stderr.write(f"Saved {len(self.headers)} unique header sets to {self.headers_path}\n")
-            
-            with open(self.cookies_path, "w") as f:
-                json.dump(self.cookies, f, indent=2)
-            sys.stderr.write(f"Cookies saved to {self.cookies_path}\n")
-            
-            await browser.close()
+                # Monitor all requests (for headers/cookies only)
+                captured_headers = []
+                seen_headers = set()
+                async def on_request(request):
+                    host_match = _HOST_RE.match(request.url)
+                    hostname = host_match.group(1).lower() if host_match else None
+                    if hostname and ("x.com" in hostname or "twitter.com" in hostname):
+                        header_tuple = tuple(sorted(request.headers.items()))
+                        if header_tuple not in seen_headers:
+                            seen_headers.add(header_tuple)
+                            captured_headers.append({"url": request.url, "headers": dict(request.headers)})
+                            sys.stderr.write(f"Captured headers for: {request.url}\n")
+                
+                page.on("request", on_request)
+                
+                # Go to login page (for login only)
+                await page.goto("https://x.com/login")
+                sys.stderr.write("\nPlease log in manually in the browser window (including 2FA if needed).\n")
+                input("Press Enter here after you have completed login and see your home feed...")
+                
+                sys.stderr.write("\nNow browse and interact with X to generate various requests.\n")
+                sys.stderr.write("Try different actions like refreshing pages, viewing profiles, etc.\n")
+                input("Press Enter when you're done...\n")
+                
+                # Save cookies and headers only
+                self.cookies = await context.cookies()
+                self.headers = captured_headers
+                
+                sys.stderr.write("Processing captured data...\n")
+                
+                self._extract_tokens_from_cookies()
+                self._process_common_headers()
+                
+                _write_json_file(self.headers_path, self.headers)
+                sys.stderr.write(f"Saved {len(self.headers)} unique header sets to {self.headers_path}\n")
+                
+                _write_json_file(self.cookies_path, self.cookies)
+                sys.stderr.write(f"Cookies saved to {self.cookies_path}\n")
+            finally:
+                # Only the context is per-login; the browser stays up for the next one
+                await context.close()
+            logged_in = True
+        finally:
+            if not logged_in:
+                # The browser or login failed; don't leave the background fetch
+                # running unawaited or its exception unretrieved
+                if not public_data_task.done():
+                    public_data_task.cancel()
+                elif not public_data_task.cancelled():
+                    public_data_task.exception()
             
-        # After Playwright login, always fetch public home/ondemand (outside Playwright)
-        self.fetch_public_home_and_ondemand()
+        # After Playwright login, make sure the public home/ondemand fetch has finished
+        await public_data_task
         
         return True
         
+    def _validate_saved_cookies(self) -> bool:
+        """Check that the saved cookies/headers are still accepted by X (blocking)"""
+        test_session = self._get_validation_session()
+        test_url = _BADGE_COUNT_URL
+        try:
+            transaction_id = None
+            try:
+                home_html, ondemand_js = self.get_transaction_generator_data()
+                if home_html and ondemand_js:
+                    home_soup = bs4.BeautifulSoup(home_html, 'html.parser')
+                    ct = ClientTransaction(home_page_response=home_soup, ondemand_file_response=_ondemand_text(ondemand_js))
+                    transaction_id = ct.generate_transaction_id(method="GET", path=_BADGE_COUNT_PATH)
+                    sys.stderr.write(f"Generated transaction ID: {transaction_id}\n")
+            except Exception as e:
+                sys.stderr.write(f"Could not generate transaction ID for debug: {str(e)}\n")
+            if transaction_id:
+                test_session.headers["x-client-transaction-id"] = transaction_id
+            else:
+                test_session.headers.pop("x-client-transaction-id", None)
+            sys.stderr.write(f"Request headers: {dict(test_session.headers)}\n")
+            sys.stderr.write(f"Request cookies: {test_session.cookies.get_dict()}\n")
+            response = test_session.get(test_url)
+            if response.status_code == 200:
+                sys.stderr.write("Authentication test SUCCESSFUL! You are still logged in.\n")
+                sys.stderr.write(f"JSON response preview: {response.text[:100]}...\n")
+                # After checking/using saved data, always fetch public home/ondemand (outside Playwright)
+                self.fetch_public_home_and_ondemand()
+                return True
+            else:
+                sys.stderr.write(f"Authentication test FAILED. Status code: {response.status_code}\n")
+                sys.stderr.write(f"Response: {response.text}\n")
+                sys.stderr.write("Your cookies/headers are no longer valid. Please re-run with force_login=True or delete the data files to log in again.\n")
+                return False
+        except Exception as e:
+            sys.stderr.write(f"Error during authentication test: {str(e)}\n")
+            sys.stderr.write("Please re-run with force_login=True or delete the data files to log in again.\n")
+            return False
+        
+    def _get_validation_session(self) -> requests.Session:
+        """Get the session used to validate saved credentials, syncing its headers and cookies"""
+        if self._validation_session is None:
+            self._validation_session = requests.Session()
+        session = self._validation_session
+        
+        # Only touch the session state when the underlying data has changed
+        if self._validation_headers_source is not self.common_headers:
+            session.headers.update(self.common_headers)
+            self._validation_headers_source = self.common_headers
+        cookies_dict = self.get_cookies_dict()
+        if self._validation_cookies_source is not cookies_dict:
+            for name, value in cookies_dict.items():
+                session.cookies.set(name, value, domain='.twitter.com')
+            self._validation_cookies_source = cookies_dict
+            
+        return session
+        
+    async def _get_browser(self) -> Browser:
+        """Get the shared browser, starting Playwright and launching Chromium on first use"""
+        if self._browser is None or not self._browser.is_connected():
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        return self._browser
+        
+    async def cleanup(self) -> None:
+        """Close the shared validation session and the warm browser"""
+        if self._validation_session is not None:
+            self._validation_session.close()
+            self._validation_session = None
+            self._validation_headers_source = None
+            self._validation_cookies_source = None
+            
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        
     def _process_common_headers(self) -> None:
         """Process captured headers to find the ones consistently used"""
         if not self.headers:
@@ -226,8 +375,7 @@ class XAuthenticator:
         
         # Save common headers
         self.common_headers = common_headers
-        with open(self.common_headers_path, "w") as f:
-            json.dump(common_headers, f, indent=2)
+        _write_json_file(self.common_headers_path, common_headers)
         
         sys.stderr.write(f"Processed and saved {len(common_headers)} common headers to {self.common_headers_path}\n")
         
@@ -246,23 +394,19 @@ class XAuthenticator:
         """Load data from saved files"""
         # Load cookies if not already loaded
         if not self.cookies and self.cookies_path.exists():
-            with open(self.cookies_path, "r") as f:
-                self.cookies = json.load(f)
+            self.cookies = _read_json_file(self.cookies_path)
                 
         # Load common headers
         if self.common_headers_path.exists():
-            with open(self.common_headers_path, "r") as f:
-                self.common_headers = json.load(f)
+            self.common_headers = _read_json_file(self.common_headers_path)
                 
         # Load home page
         if self.home_path.exists():
-            with open(self.home_path, "r", encoding="utf-8") as f:
-                self.home_html = f.read()
+            self.home_html = self.home_path.read_text(encoding="utf-8")
                 
         # Load ondemand file
         if self.ondemand_path.exists():
-            with open(self.ondemand_path, "r", encoding="utf-8") as f:
-                self.ondemand_js = f.read()
+            self.ondemand_js = self.ondemand_path.read_text(encoding="utf-8")
                 
         # Extract tokens from cookies
         self._extract_tokens_from_cookies()
@@ -296,12 +440,29 @@ class XAuthenticator:
         if not self.cookies:
             self._load_saved_data()
             
+        # Reuse the converted dictionary until the cookie list is replaced
+        if self._cookies_dict is not None:
+            return self._cookies_dict
+            
         cookies_dict = {}
         for cookie in self.cookies:
             if 'name' in cookie and 'value' in cookie:
                 cookies_dict[cookie['name']] = cookie['value']
                 
+        self._cookies_dict = cookies_dict
         return cookies_dict
+        
+    def prime_cache(self) -> None:
+        """
+        Load everything the getters serve into memory
+        
+        This does blocking file I/O, so async callers should run it in a worker
+        thread; afterwards the getters return cached data without touching disk.
+        """
+        self._load_saved_data()
+        self.get_public_transaction_generator_data()
+        if self.cookies:
+            self._build_cookie_header()
 
     def fetch_public_home_and_ondemand(self):
         """Fetch the public (non-authenticated) X.com homepage and ondemand.s JS file, unless they already exist and are non-empty."""
@@ -315,6 +476,8 @@ class XAuthenticator:
             sys.stderr.write(f"Reusing existing public ondemand.s JS: {public_ondemand_path}\n")
         if not need_fetch_home and not need_fetch_ondemand:
             return
+        # The files on disk are about to change, so drop any cached copy
+        self._public_transaction_data = None
         session = requests.Session()
         session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
@@ -325,8 +488,7 @@ class XAuthenticator:
                 f.write(home_page.text)
             sys.stderr.write(f"Public homepage HTML saved to {public_home_path}\n")
         else:
-            with open(public_home_path, "r", encoding="utf-8") as f:
-                home_page_text = f.read()
+            home_page_text = public_home_path.read_text(encoding="utf-8")
         # Always parse the home HTML to get the ondemand.s URL
         if need_fetch_home:
             home_html = home_page.text
@@ -349,29 +511,29 @@ class XAuthenticator:
         fallback_ondemand_path = self.data_dir / "x_ondemand.js"
         if public_ondemand_path.exists():
             sys.stderr.write(f"Using public ondemand.s JS: {public_ondemand_path}\n")
-            with open(public_ondemand_path, "r", encoding="utf-8") as f:
-                return f.read()
+            return public_ondemand_path.read_text(encoding="utf-8")
         elif fallback_ondemand_path.exists():
             sys.stderr.write(f"Warning: Public ondemand.s JS not found. Using Playwright-captured ondemand.s: {fallback_ondemand_path}\n")
-            with open(fallback_ondemand_path, "r", encoding="utf-8") as f:
-                return f.read()
+            return fallback_ondemand_path.read_text(encoding="utf-8")
         else:
             raise FileNotFoundError("No ondemand.s JS file found (neither public nor Playwright-captured)")
 
     def get_public_transaction_generator_data(self):
         """Load the public homepage and best available ondemand.s JS for transaction ID generation."""
+        if self._public_transaction_data is not None:
+            return self._public_transaction_data
         public_home_path = self.data_dir / "x_home.html"
         sys.stderr.write(f"Looking for public home HTML at: {public_home_path}\n")
         if not public_home_path.exists():
             sys.stderr.write(f"ERROR: {public_home_path} does not exist!\n")
             return None, None
-        with open(public_home_path, "r", encoding="utf-8") as f:
-            home_html = f.read()
+        home_html = public_home_path.read_text(encoding="utf-8")
         if not home_html.strip():
             sys.stderr.write(f"ERROR: {public_home_path} is empty!\n")
             return None, None
         ondemand_js = self.get_best_ondemand_js()
-        return home_html, ondemand_js
+        self._public_transaction_data = (home_html, ondemand_js)
+        return self._public_transaction_data
 
     async def debug_api_call(self, url: str, method: str = "GET", data: dict = None):
         """Make a real API call with full debug logging, using captured credentials and transaction ID."""
@@ -388,13 +550,12 @@ class XAuthenticator:
         #     headers['authorization'] = f"Bearer {self.auth_token}"
         if self.csrf_token:
             headers['x-csrf-token'] = self.csrf_token
-        headers['cookie'] = "; ".join([f"{k}={v}" for k, v in cookies_dict.items()])
+        headers['cookie'] = self.cookie_header
         # Use public home/ondemand for transaction ID generation
         home_html, ondemand_js = self.get_public_transaction_generator_data()
         if home_html and ondemand_js:
             home_soup = bs4.BeautifulSoup(home_html, 'html.parser')
-            ondemand_soup = bs4.BeautifulSoup(ondemand_js, 'html.parser')
-            ct = ClientTransaction(home_page_response=home_soup, ondemand_file_response=ondemand_soup)
+            ct = ClientTransaction(home_page_response=home_soup, ondemand_file_response=_ondemand_text(ondemand_js))
             path = urlparse(url).path
             transaction_id = ct.generate_transaction_id(method=method, path=path)
             headers['x-client-transaction-id'] = transaction_id
@@ -420,21 +581,24 @@ class XAuthenticator:
 # Example of how to use this class from another script:
 async def example_usage(force_login=False):
     auth = XAuthenticator(data_dir="./x_data")
-    success = await auth.login(force_login=force_login)
-    
-    if success:
-        # Get data for requests
-        common_headers = auth.get_common_headers()
-        cookies_dict = auth.get_cookies_dict()
-        home_html, ondemand_js = auth.get_transaction_generator_data()
-        
-        sys.stderr.write(f"Got {len(common_headers)} common headers\n")
-        sys.stderr.write(f"Got {len(cookies_dict)} cookies\n")
-        sys.stderr.write(f"Home HTML size: {len(home_html)} bytes\n")
-        sys.stderr.write(f"Ondemand.js size: {len(ondemand_js) if ondemand_js else 0} bytes\n")
-        # Demonstrate a real API call with full debug logging
-        test_url = "https://x.com/i/api/2/badge_count/badge_count.json?supports_ntab_urt=1"
-        await auth.debug_api_call(test_url, method="GET")
+    try:
+        success = await auth.login(force_login=force_login)
+        
+        if success:
+            # Get data for requests
+            common_headers = auth.get_common_headers()
+            cookies_dict = auth.get_cookies_dict()
+            home_html, ondemand_js = auth.get_transaction_generator_data()
+            
+            sys.stderr.write(f"Got {len(common_headers)} common headers\n")
+            sys.stderr.write(f"Got {len(cookies_dict)} cookies\n")
+            sys.stderr.write(f"Home HTML size: {len(home_html)} bytes\n")
+            sys.stderr.write(f"Ondemand.js size: {len(ondemand_js) if ondemand_js else 0} bytes\n")
+            # Demonstrate a real API call with full debug logging
+            await auth.debug_api_call(_BADGE_COUNT_URL, method="GET")
+    finally:
+        # Close the warm browser and validation session
+        await auth.cleanup()
 
 if __name__ == "__main__":
     import sys
@@ -1,9 +1,15 @@
 import asyncio
+import logging
 import os
 import sys
-import traceback
 from pathlib import Path
 
+try:
+    import uvloop
+except ImportError:
+    # uvloop is not available on Windows; fall back to the default event loop
+    uvloop = None
+
 # Add the server directory to the path
 server_dir = Path(__file__).parent
 if str(server_dir) not in sys.path:
@@ -13,9 +19,20 @@ if str(server_dir) not in sys.path:
 from service.x_service import XService
 from tools.x_tools import mcp  # Import the mcp instance
 
+log = logging.getLogger(__name__)
+
 # Global X service instance
 x_service = None
 
+# Shared default for tool calls without parameters (only ever unpacked, never mutated)
+_EMPTY_PARAMS = {}
+
+# Error response templates for the patched execute handler
+_ERR_EXEC_CODE = -32000
+_ERR_EXEC_TMPL = "Error executing tool %s: %s"
+_ERR_NOT_FOUND_CODE = -32601
+_ERR_NOT_FOUND_TMPL = "Tool %s not found"
+
 async def initialize_x_service():
     """Initialize the X service"""
     global x_service
@@ -25,15 +42,14 @@ async def initialize_x_service():
         if not data_dir:
             data_dir = os.path.join(os.path.dirname(__file__), "auth", "x_data")
             
-        print(f"Initializing X service with data directory: {data_dir}")
+        log.info("Initializing X service with data directory: %s", data_dir)
         x_service = XService(data_dir=data_dir)
         init_result = await x_service.initialize_client()
-        print("X service initialization result:", init_result)
+        log.info("X service initialization result: %s", init_result)
         
         return init_result["status"] == "success"
     except Exception as e:
-        print(f"Error initializing X service: {e}")
-        traceback.print_exc()
+        log.exception("Error initializing X service: %s", e)
         return False
 
 async def patch_mcp_tool_execution():
@@ -43,38 +59,48 @@ async def patch_mcp_tool_execution():
     # Store the original handle_request method
     original_handle_request = mcp.handle_request
     
+    # Index the tools by name once so each request is a dict lookup
+    def build_index():
+        return {tool.name: tool.func for tool in mcp.tools}
+    tool_index = build_index()
+    
+    # Bind everything the handler needs as closure locals so the per-request
+    # path does no global lookups (x_service is initialized before patching)
+    service = x_service
+    execute_method = "execute"
+    empty_params = _EMPTY_PARAMS
+    
     # Define a new handle_request method that injects x_service
     async def patched_handle_request(request_id, method, params):
-        if method == "execute":
+        if method == execute_method:
             tool_name = params.get("command")
-            tool_params = params.get("params", {})
+            tool_params = params.get("params") or empty_params
             
-            # Get the tool function
-            tool_func = None
-            for tool in mcp.tools:
-                if tool.name == tool_name:
-                    tool_func = tool.func
-                    break
+            # Get the tool function, rebuilding the index on a miss in case
+            # tools were registered after the server was patched
+            tool_func = tool_index.get(tool_name)
+            if tool_func is None:
+                tool_index.update(build_index())
+                tool_func = tool_index.get(tool_name)
             
-            if tool_func:
+            if tool_func is not None:
                 try:
                     # Call the tool function with x_service as first parameter
-                    result = await tool_func(x_service, **tool_params)
+                    result = await tool_func(service, **tool_params)
                     return {"result": result}
                 except Exception as e:
-                    error_msg = f"Error executing tool {tool_name}: {str(e)}"
-                    print(error_msg)
-                    traceback.print_exc()
-                    return {"error": {"code": -32000, "message": error_msg}}
+                    error_msg = _ERR_EXEC_TMPL % (tool_name, e)
+                    log.exception(error_msg)
+                    return {"error": {"code": _ERR_EXEC_CODE, "message": error_msg}}
             else:
-                return {"error": {"code": -32601, "message": f"Tool {tool_name} not found"}}
+                return {"error": {"code": _ERR_NOT_FOUND_CODE, "message": _ERR_NOT_FOUND_TMPL % tool_name}}
         
         # For other methods (like initialize), use the original handler
         return await original_handle_request(request_id, method, params)
     
     # Replace the handle_request method
     mcp.handle_request = patched_handle_request
-    print(f"Patched MCP server to include x_service in tool calls")
+    log.info("Patched MCP server to include x_service in tool calls")
 
 async def main():
     """Main entry point for the MCP server"""
@@ -82,28 +108,47 @@ async def main():
         # Initialize the X service
         success = await initialize_x_service()
         if not success:
-            print("Failed to initialize X service")
+            log.error("Failed to initialize X service")
             return
         
         # Patch the MCP server to include x_service in tool calls
         await patch_mcp_tool_execution()
         
         # Print available tools
-        print(f"Available tools: {[tool.name for tool in mcp.tools]}")
+        log.info("Available tools: %s", [tool.name for tool in mcp.tools])
         
         # Run the MCP server
-        print("Starting MCP server...")
+        log.info("Starting MCP server...")
         await mcp.run_async()
         
     except Exception as e:
-        print(f"Error: {e}")
-        traceback.print_exc()
+        log.exception("Error: %s", e)
     finally:
         # Clean up resources
         global x_service
         if x_service is not None:
             await x_service.cleanup()
 
+def run_server():
+    """Run the main coroutine, using uvloop's event loop when it is installed"""
+    # Log to stderr (stdout carries the MCP protocol) at INFO by default so debug
+    # messages are never even formatted; set X_LOG_LEVEL=DEBUG to see them
+    level_name = os.environ.get("X_LOG_LEVEL", "INFO").upper()
+    level = logging.getLevelName(level_name)
+    if isinstance(level, int):
+        logging.basicConfig(level=level, stream=sys.stderr)
+    else:
+        logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+        log.warning("Unknown X_LOG_LEVEL %r, logging at INFO", level_name)
+    if uvloop is None:
+        asyncio.run(main())
+    elif sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        uvloop.install()
+        asyncio.run(main())
+
 if __name__ == "__main__":
     # Run the main coroutine
-    asyncio.run(main())
+    run_server()
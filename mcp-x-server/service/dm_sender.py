@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# How many DMs (to different users) may be in flight at once
+DEFAULT_MAX_CONCURRENCY = 5
+
+class DMSender:
+    """
+    Send direct messages from a background worker
+
+    Messages are queued with submit() and sent by the worker. Messages to the
+    same user go out one at a time in the order they were queued, so a
+    conversation is never reordered; messages to different users are sent
+    concurrently.
+    """
+    def __init__(self, client, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        """
+        Initialize the sender
+        
+        Args:
+            client: The twikit client to send with
+            max_concurrency: Maximum number of DMs sent at the same time
+        """
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._queue: Optional[asyncio.Queue] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Messages waiting per user, and the task draining each user's messages
+        self._pending: Dict[str, Deque[Tuple[str, Optional[str], asyncio.Future]]] = {}
+        self._user_tasks: Dict[str, asyncio.Task] = {}
+    
+    def start(self):
+        """Start the background worker on the running event loop"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._worker = asyncio.create_task(self._run())
+            log.debug("Started DM sender")
+    
+    def submit(self, user_id: str, text: str, media_id: Optional[str] = None) -> asyncio.Future:
+        """
+        Queue a direct message for sending
+        
+        Args:
+            user_id: The ID of the user to send to
+            text: The message text
+            media_id: Optional media ID to attach
+        
+        Returns:
+            A future resolved with the sent message, or with the error if
+            sending failed
+        """
+        if self._worker is None:
+            raise RuntimeError("DM sender is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((user_id, text, media_id, future))
+        return future
+    
+    async def _run(self):
+        """Hand queued messages to a per-user drain task"""
+        while True:
+            user_id, text, media_id, future = await self._queue.get()
+            messages = self._pending.get(user_id)
+            if messages is None:
+                messages = self._pending[user_id] = deque()
+            messages.append((text, media_id, future))
+            if user_id not in self._user_tasks:
+                self._user_tasks[user_id] = asyncio.create_task(self._drain(user_id, messages))
+    
+    async def _drain(self, user_id: str, messages: Deque[Tuple[str, Optional[str], asyncio.Future]]):
+        """Send one user's queued messages in order"""
+        try:
+            while messages:
+                text, media_id, future = messages.popleft()
+                if future.done():
+                    # The caller gave up before the message was sent
+                    continue
+                try:
+                    async with self._semaphore:
+                        message = await self.client.send_dm(user_id, text, media_id)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                except BaseException:
+                    # Cancelled by stop() mid-send; this message is no longer in
+                    # _pending, so fail it here or its caller waits forever
+                    if not future.done():
+                        future.set_exception(RuntimeError("DM sender stopped while the message was being sent"))
+                    raise
+                else:
+                    if not future.done():
+                        future.set_result(message)
+        finally:
+            del self._pending[user_id]
+            del self._user_tasks[user_id]
+    
+    async def stop(self):
+        """Stop the worker and fail any messages that were not sent"""
+        if self._worker is None:
+            return
+        # Collect what is still queued before the drain tasks clear it
+        unsent = [future for messages in self._pending.values() for _, _, future in messages]
+        while not self._queue.empty():
+            unsent.append(self._queue.get_nowait()[3])
+        
+        tasks = [self._worker, *self._user_tasks.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker = None
+        
+        # Fail the unsent messages so no caller waits forever
+        for future in unsent:
+            if not future.done():
+                future.set_exception(RuntimeError("DM sender stopped before the message was sent"))
+        self._pending.clear()
+        self._user_tasks.clear()
+        if unsent:
+            log.warning("DM sender stopped with %d unsent messages", len(unsent))
+        log.debug("Stopped DM sender")
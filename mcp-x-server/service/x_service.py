@@ -1,16 +1,70 @@
+import asyncio
+import logging
 import os
 import sys
-import traceback
 from pathlib import Path
 from typing import Dict, Optional, Any
 import bs4
+import httpx
 
 from twikit import Client
 from x_client_transaction import ClientTransaction
 
 from auth.x_authenticator import XAuthenticator
+from service.dm_sender import DMSender
 from utils.client_patcher import ClientPatcher
 
+log = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 -- only needed so httpx can negotiate HTTP/2
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# One keep-alive pool for every API call the client makes during the server's life
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60)
+# Give slow API responses time to arrive, but fail fast when a connection can't be made
+_HTTP_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+
+# Constant part of the post_tweet success envelope, built once and merged with
+# the per-call fields
+_POST_OK_FIELDS = {"status": "success", "message": "Successfully posted tweet"}
+
+def _format_search_tweet(tweet) -> Dict[str, Any]:
+    """Format a tweet returned by search into a plain dictionary"""
+    # Handle created_at field (could be string or datetime)
+    created_at = getattr(tweet, 'created_at', None)
+    isoformat = getattr(created_at, 'isoformat', None)
+    if isoformat is not None:
+        created_at = isoformat()
+    elif not isinstance(created_at, str):
+        created_at = None
+    
+    # Read the user fields with one lookup instead of probing the tweet per field
+    user = getattr(tweet, 'user', None)
+    try:
+        user_id, user_name, user_screen_name = user.id, user.name, user.screen_name
+    except AttributeError:
+        user_id = user_name = user_screen_name = None
+    
+    return {
+        "id": getattr(tweet, 'id', None),
+        "text": getattr(tweet, 'text', ''),
+        "created_at": created_at,
+        "user": {
+            "id": user_id,
+            "name": user_name,
+            "screen_name": user_screen_name
+        },
+        "favorite_count": getattr(tweet, 'favorite_count', 0),
+        "retweet_count": getattr(tweet, 'retweet_count', 0),
+        "reply_count": getattr(tweet, 'reply_count', 0),
+        "quote_count": getattr(tweet, 'quote_count', 0),
+        "is_quote_status": getattr(tweet, 'is_quote_status', False),
+        "lang": getattr(tweet, 'lang', None)
+    }
+
 class XService:
     """
     Service for interacting with the X API
@@ -36,44 +90,54 @@ class XService:
         self.client = None
         self.client_patcher = None
         self.client_transaction = None
+        self.dm_sender = None
+        
+        # Parsed home page for transaction ID generation, built once per process
+        self.home_soup = None
         
         # Initialize the XAuthenticator
         self.auth = XAuthenticator(data_dir=str(self.data_dir))
-        print(f"Initialized XAuthenticator with data_dir: {self.data_dir}")
+        log.debug("Initialized XAuthenticator with data_dir: %s", self.data_dir)
     
     async def initialize_client(self):
         """Initialize the X client with authentication"""
         try:
-            print("Loading Playwright data...")
+            log.debug("Loading Playwright data...")
+            # Read the saved files off the event loop; the getters below are then
+            # served from the authenticator's in-memory caches
+            await asyncio.to_thread(self.auth.prime_cache)
             common_headers = self.auth.get_common_headers()
-            cookies_dict = self.auth.get_cookies_dict()
             home_html_str, ondemand_js_str = self.auth.get_public_transaction_generator_data()
-            print("Playwright data loaded successfully")
+            log.debug("Playwright data loaded successfully")
 
-            # Parse HTML/JS for transaction ID generation
-            home_soup = bs4.BeautifulSoup(home_html_str, 'lxml')
-            ondemand_soup = bs4.BeautifulSoup(ondemand_js_str, 'lxml')
-            print("Parsed HTML/JS for transaction ID generation")
+            # Parse the home HTML for transaction ID generation (only on first initialization).
+            # ClientTransaction type-checks the home page as a BeautifulSoup document, but the
+            # ondemand file is only read as text, so the JS is passed through without parsing.
+            if self.home_soup is None:
+                self.home_soup = bs4.BeautifulSoup(home_html_str, 'lxml')
+                log.debug("Parsed home HTML for transaction ID generation")
 
-            # Initialize the client
-            self.client = Client('en-US')
-            print("Initialized twikit.Client")
+            # Initialize the client, closing the connection pool of any previous one
+            if self.client:
+                await self.client.http.aclose()
+            self.client = Client('en-US', http2=_HTTP2, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+            log.debug("Initialized twikit.Client")
 
             # Initialize custom ClientTransaction
             self.client_transaction = ClientTransaction(
-                home_page_response=home_soup, 
-                ondemand_file_response=ondemand_soup
+                home_page_response=self.home_soup, 
+                ondemand_file_response=ondemand_js_str
             )
-            print("Initialized custom ClientTransaction")
+            log.debug("Initialized custom ClientTransaction")
             
             # Initialize and apply the client patcher
             self.client_patcher = ClientPatcher(self.client_transaction)
             self.client_patcher.patch_client(self.client)
-            print("Applied client patches")
+            log.debug("Applied client patches")
 
-            # Set up headers for requests
-            cookie_header_value = "; ".join([f"{name}={value}" for name, value in cookies_dict.items()])
-            ct0_token = cookies_dict.get('ct0')
+            # Set up headers for requests (both values are cached on the authenticator)
+            cookie_header_value = self.auth.cookie_header
+            ct0_token = self.auth.ct0_token
             
             if not ct0_token:
                 raise ValueError("No 'ct0' token found in cookies. Please log in first.")
@@ -81,29 +145,44 @@ class XService:
             # Set up the headers
             self.client_patcher.setup_headers(cookie_header_value, ct0_token)
             self.client_patcher.update_headers(common_headers)
-            print("Set up request headers")
+            log.debug("Set up request headers")
+
+            # Start the background DM sender (replacing one from a previous initialization)
+            if self.dm_sender:
+                await self.dm_sender.stop()
+            self.dm_sender = DMSender(self.client)
+            self.dm_sender.start()
 
             self.authenticated = True
             return {"status": "success", "message": "X client initialized successfully"}
 
         except Exception as e:
             error_msg = f"Error initializing X client: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+            log.exception("Error initializing X client")
             return {"status": "error", "message": error_msg}
     
     async def cleanup(self):
         """Clean up patches and resources"""
-        try:
-            if self.client_patcher:
-                self.client_patcher.cleanup()
-                
-            if hasattr(self, 'client') and self.client:
-                await self.client.http.close()
-                
-            print("Cleaned up X service resources")
-        except Exception as e:
-            print(f"Error during cleanup: {e}")
+        # Run the teardown steps concurrently; one failing must not skip the others
+        teardown = [self._cleanup_patches_and_auth()]
+        if self.dm_sender:
+            teardown.append(self.dm_sender.stop())
+        if self.client:
+            teardown.append(self.client.http.aclose())
+        results = await asyncio.gather(*teardown, return_exceptions=True)
+        
+        # Report outside the gather so messages come out in a fixed order
+        errors = [result for result in results if isinstance(result, Exception)]
+        for error in errors:
+            log.error("Error during cleanup: %s", error)
+        if not errors:
+            log.debug("Cleaned up X service resources")
+    
+    async def _cleanup_patches_and_auth(self):
+        """Restore the twikit patches and release authenticator resources"""
+        if self.client_patcher:
+            self.client_patcher.cleanup()
+        await self.auth.cleanup()
     
     async def post_tweet(self, text: str) -> dict:
         """Post a tweet using the authenticated client"""
@@ -111,19 +190,13 @@ class XService:
             return {"status": "error", "message": "Not authenticated. Please log in first."}
         
         try:
-            print(f"Attempting to post tweet: '{text}'")
+            log.debug("Attempting to post tweet: %r", text)
             tweet = await self.client.create_tweet(text=text)
-            print(f"Successfully posted tweet with ID: {tweet.id}")
-            return {
-                "status": "success", 
-                "message": "Successfully posted tweet",
-                "tweet_id": tweet.id,
-                "text": text
-            }
+            log.debug("Successfully posted tweet with ID: %s", tweet.id)
+            return {**_POST_OK_FIELDS, "tweet_id": tweet.id, "text": text}
         except Exception as e:
             error_msg = f"Failed to post tweet: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+            log.exception("Failed to post tweet")
             return {"status": "error", "message": error_msg}
             
     async def search_tweets(self, query: str, count: int = 10, mode: str = 'Latest') -> dict:
@@ -142,39 +215,12 @@ class XService:
             return {"status": "error", "message": "Not authenticated. Please log in first."}
             
         try:
-            print(f"Searching for tweets with query: '{query}' (count: {count}, mode: {mode})")
+            log.debug("Searching for tweets with query: %r (count: %s, mode: %s)", query, count, mode)
             
             # Use the client to search for tweets
             # The second parameter is the search mode (e.g., 'Latest', 'Top', 'People', etc.)
             tweets = await self.client.search_tweet(query, mode, count=count)
-            
-            # Format the results
-            formatted_tweets = []
-            for tweet in tweets:
-                # Handle created_at field (could be string or datetime)
-                created_at = None
-                if hasattr(tweet, 'created_at'):
-                    if hasattr(tweet.created_at, 'isoformat'):
-                        created_at = tweet.created_at.isoformat()
-                    elif isinstance(tweet.created_at, str):
-                        created_at = tweet.created_at
-                
-                formatted_tweets.append({
-                    "id": getattr(tweet, 'id', None),
-                    "text": getattr(tweet, 'text', ''),
-                    "created_at": created_at,
-                    "user": {
-                        "id": tweet.user.id if hasattr(tweet, 'user') and tweet.user else None,
-                        "name": tweet.user.name if hasattr(tweet, 'user') and tweet.user else None,
-                        "screen_name": tweet.user.screen_name if hasattr(tweet, 'user') and tweet.user else None
-                    },
-                    "favorite_count": getattr(tweet, 'favorite_count', 0),
-                    "retweet_count": getattr(tweet, 'retweet_count', 0),
-                    "reply_count": getattr(tweet, 'reply_count', 0),
-                    "quote_count": getattr(tweet, 'quote_count', 0),
-                    "is_quote_status": getattr(tweet, 'is_quote_status', False),
-                    "lang": getattr(tweet, 'lang', None)
-                })
+            formatted_tweets = [_format_search_tweet(tweet) for tweet in tweets]
                 
             return {
                 "status": "success",
@@ -185,6 +231,5 @@ class XService:
             
         except Exception as e:
             error_msg = f"Error searching tweets: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+            log.exception("Error searching tweets")
             return {"status": "error", "message": error_msg}
@@ -1,126 +1,411 @@
 from fastmcp import FastMCP
-from typing import Dict, Any, List, Optional, Tuple, Literal
-import traceback
+from pydantic import Field
+
+from utils.coalesce import single_flight
+from utils.tool_cache import CacheDict, async_ttl_cache, invalidate_cache, invalidate_results
+from typing import Annotated, Callable, Collection, Dict, Any, FrozenSet, List, Optional, Tuple, Literal, get_args
+import asyncio
+import functools
+import inspect
+import logging
+import operator
 import time
 
 # Type aliases for clarity
 TweetType = Literal['Tweets', 'Replies', 'Media', 'Likes']
 ProductType = Literal['Top', 'Latest', 'Media']
 TrendType = Literal['trending', 'for-you', 'news', 'sports', 'entertainment']
+SearchMode = Literal['Latest', 'Top', 'People', 'Photos', 'Videos']
+
+# Declared in the tool schemas so MCP clients and FastMCP's own argument
+# validation reject empty values up front
+NonEmptyStr = Annotated[str, Field(min_length=1)]
+
+log = logging.getLogger(__name__)
 
 # Create a MCP server instance
 mcp = FastMCP("X MCP Server")
 
 # ---- Shared Validators and Helpers ----
 
+class FrozenResponse(dict):
+    """A constant response dict shared between calls; mutating it raises TypeError."""
+    __slots__ = ()
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared response dicts are read-only; copy() it first")
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+    
+    def __reduce__(self):
+        # Copies and pickles come back as ordinary, mutable dicts
+        return (dict, (dict(self),))
+
+# Responses whose content never changes, built once at import
+EMPTY_TEXT_ERROR = FrozenResponse(status="error", message="Text cannot be empty")
+SERVICE_NOT_INITIALIZED_ERROR = FrozenResponse(status="error", message="X service not initialized. Please check the server logs.")
+SERVICE_NOT_AUTHENTICATED_ERROR = FrozenResponse(status="error", message="X service not authenticated. Please log in first.")
+TWEET_DELETED_RESPONSE = FrozenResponse(status="success", message="Tweet successfully deleted")
+TWEET_UNLIKED_RESPONSE = FrozenResponse(status="success", message="Successfully unliked tweet")
+TWEET_RETWEETED_RESPONSE = FrozenResponse(status="success", message="Successfully retweeted tweet")
+DM_DELETED_RESPONSE = FrozenResponse(status="success", message="Successfully deleted direct message")
+QUEUED_DM_RESPONSE = FrozenResponse(status="accepted", message="Direct message queued for sending")
+
+# Accepted modes, in the order the error messages list them
+_SEARCH_MODE_NAMES = get_args(SearchMode)
+_SEARCH_MODES = frozenset(_SEARCH_MODE_NAMES)
+_INVALID_SEARCH_MODE_ERROR = FrozenResponse(status="error", message=f"Invalid mode. Must be one of: {', '.join(_SEARCH_MODE_NAMES)}")
+_TWEET_TYPE_NAMES = get_args(TweetType)
+_TREND_CATEGORY_NAMES = get_args(TrendType)
+
+# Count bounds for the follower and following listings, retweeters, and user timelines
+_FOLLOWER_COUNT_BOUNDS = (1, 50)
+_RETWEETER_COUNT_BOUNDS = (1, 40)
+_USER_TWEET_COUNT_BOUNDS = (1, 100)
+
+_INVALID_SCHEDULE_TIME_ERROR = FrozenResponse(status="error", message="Scheduled time must be a valid Unix timestamp (in seconds)")
+_PAST_SCHEDULE_TIME_ERROR = FrozenResponse(status="error", message="Scheduled time must be in the future")
+
+@functools.lru_cache(maxsize=16)
+def _empty_id_error(name: str) -> FrozenResponse:
+    """The shared error response for an empty ID of the given kind."""
+    return FrozenResponse(status="error", message=f"{name} cannot be empty")
+
+def truncate_utf16(text: str, max_length: int = 280) -> str:
+    """Truncate text to at most max_length UTF-16 code units, as X counts them."""
+    # ASCII is one code unit per character, so the usual case is a plain slice
+    if text.isascii():
+        return text[:max_length]
+    
+    encoded = text.encode('utf-16-le')
+    if len(encoded) <= 2 * max_length:
+        return text
+    
+    encoded = encoded[:2 * max_length]
+    # Never split a surrogate pair: drop a dangling high surrogate at the cut
+    if 0xD8 <= encoded[-1] <= 0xDB:
+        encoded = encoded[:-2]
+    return encoded.decode('utf-16-le')
+
 def validate_text(text: str, max_length: int = 280) -> Tuple[bool, Dict]:
     """Validate text input for tweets and messages."""
-    if not text or not isinstance(text, str) or len(text.strip()) == 0:
-        return False, {"status": "error", "message": "Text cannot be empty"}
+    if not isinstance(text, str):
+        return False, EMPTY_TEXT_ERROR
     
+    # Strip once; strip() and an in-bounds truncation both return the same
+    # string object when there is nothing to remove, so clean input is never copied
     text = text.strip()
-    return True, {"text": text[:max_length] if len(text) > max_length else text}
+    if not text:
+        return False, EMPTY_TEXT_ERROR
+    return True, {"text": truncate_utf16(text, max_length)}
 
 def validate_id(id_str: str, name: str = "ID") -> Tuple[bool, Dict]:
     """Validate an ID string."""
     if not id_str or not isinstance(id_str, str) or len(id_str.strip()) == 0:
-        return False, {"status": "error", "message": f"{name} cannot be empty"}
+        return False, _empty_id_error(name)
     return True, {}
 
-def validate_count(count: int, min_count: int = 1, max_count: int = 100) -> int:
+def validate_count(count: int, min_count: int = 1, max_count: int = 100, default: int = 20) -> int:
     """Validate and normalize count parameter."""
-    try:
-        count = int(count)
-    except (ValueError, TypeError):
-        count = 20  # Default
-    
-    return max(min_count, min(max_count, count))
+    # Plain ints (the usual case) skip the conversion and its exception handling
+    if type(count) is not int:
+        try:
+            count = int(count)
+        except (ValueError, TypeError):
+            count = default
+    
+    return min(max_count, max(min_count, count))
 
-def validate_mode(mode: str, valid_modes: List[str]) -> Tuple[bool, Dict]:
-    """Validate mode parameter against valid options."""
-    if mode not in valid_modes:
-        return False, {"status": "error", "message": f"Invalid mode. Must be one of: {', '.join(valid_modes)}"}
+@functools.lru_cache(maxsize=16)
+def _mode_checker(valid_modes: Tuple[str, ...]) -> Tuple[FrozenSet[str], FrozenResponse]:
+    """The lookup set and shared error response for a tuple of valid modes."""
+    return frozenset(valid_modes), FrozenResponse(status="error", message=f"Invalid mode. Must be one of: {', '.join(valid_modes)}")
+
+def validate_mode(mode: str, valid_modes: Collection[str]) -> Tuple[bool, Dict]:
+    """Validate mode parameter against valid options (listed in their given order on error)."""
+    # tuple() of a tuple is the tuple itself, so the usual call is one cache hit
+    modes, error_response = _mode_checker(tuple(valid_modes))
+    if not isinstance(mode, str) or mode not in modes:
+        return False, error_response
     return True, {}
 
 def log_debug(prefix: str, message: str, *args):
-    """Consistent debug logging."""
-    formatted_args = ', '.join(f"{arg}" for arg in args)
-    if args:
-        print(f"[DEBUG] {prefix}: {message} ({formatted_args})")
-    else:
-        print(f"[DEBUG] {prefix}: {message}")
+    """
+    Consistent debug logging.
+    
+    `message` is a %-style format string for `args`; nothing is formatted
+    unless DEBUG is enabled.
+    """
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(f"{prefix}: {message}", *args)
 
 def log_error(prefix: str, message: str, err=None):
-    """Consistent error logging with optional exception details."""
-    print(f"[ERROR] {prefix}: {message}")
-    if err:
-        traceback.print_exc()
+    """Consistent error logging; tracebacks are only formatted at DEBUG level."""
+    log.error("%s: %s", prefix, message, exc_info=err if err is not None and log.isEnabledFor(logging.DEBUG) else None)
+
+def exception_response(message: str, err: BaseException) -> Dict[str, Any]:
+    """Build the error response for a failed call, naming the exception type."""
+    return {"status": "error", "message": message, "error_type": type(err).__name__}
 
 def check_x_service(x_service) -> tuple[bool, dict]:
     """Check if the X service is properly initialized and authenticated."""
     if not x_service:
-        return False, {"status": "error", "message": "X service not initialized. Please check the server logs."}
+        return False, SERVICE_NOT_INITIALIZED_ERROR
     if not hasattr(x_service, 'authenticated') or not x_service.authenticated:
-        return False, {"status": "error", "message": "X service not authenticated. Please log in first."}
+        return False, SERVICE_NOT_AUTHENTICATED_ERROR
     return True, {}
 
+def x_tool(error: str, validate_ids: Tuple[Tuple[str, str], ...] = (),
+           counts: Tuple[Tuple[str, int, int], ...] = (),
+           modes: Tuple[Tuple[str, Collection[str]], ...] = ()):
+    """
+    Wrap a tool body with the shared prologue and error handling.
+    
+    The named parameters are checked in one pass before the body runs: IDs with
+    validate_id, modes with validate_mode, and counts are clamped with
+    validate_count (falling back to the parameter's default). Then the X service
+    is checked; any exception the body raises is logged and returned as
+    "<error>: <exception>".
+    
+    Args:
+        error: Prefix for the error message returned when the body raises
+        validate_ids: (parameter name, display name) pairs checked with validate_id
+        counts: (parameter name, min, max) triples clamped with validate_count
+        modes: (parameter name, valid values) pairs checked with validate_mode
+    """
+    def decorator(func):
+        tool_name = func.__name__
+        signature = inspect.signature(func).parameters
+        params = list(signature)
+        # Positions exclude x_service, which the wrapper takes separately
+        id_checks = tuple((param, label, params.index(param) - 1) for param, label in validate_ids)
+        mode_checks = tuple((param, valid_modes, params.index(param) - 1) for param, valid_modes in modes)
+        count_checks = tuple(
+            (param, min_count, max_count, signature[param].default, params.index(param) - 1)
+            for param, min_count, max_count in counts
+        )
+        
+        @functools.wraps(func)
+        async def wrapper(x_service, *args, **kwargs):
+            for param, label, position in id_checks:
+                if param in kwargs:
+                    value = kwargs[param]
+                else:
+                    value = args[position] if position < len(args) else None
+                is_valid, error_response = validate_id(value, label)
+                if not is_valid:
+                    return error_response
+            
+            # Omitted modes and counts take the parameter defaults, which are valid
+            for param, valid_modes, position in mode_checks:
+                if param in kwargs:
+                    value = kwargs[param]
+                elif position < len(args):
+                    value = args[position]
+                else:
+                    continue
+                is_valid, error_response = validate_mode(value, valid_modes)
+                if not is_valid:
+                    return error_response
+            
+            if count_checks:
+                args = list(args)
+                for param, min_count, max_count, default, position in count_checks:
+                    if param in kwargs:
+                        kwargs[param] = validate_count(kwargs[param], min_count, max_count, default)
+                    elif position < len(args):
+                        args[position] = validate_count(args[position], min_count, max_count, default)
+            
+            is_ready, error_response = check_x_service(x_service)
+            if not is_ready:
+                return error_response
+            
+            try:
+                return await func(x_service, *args, **kwargs)
+            except Exception as e:
+                error_msg = f"{error}: {str(e)}"
+                log_error(tool_name, error_msg, e)
+                return exception_response(error_msg, e)
+        return wrapper
+    return decorator
+
+# Fields read in bulk with a single attrgetter call per object
+_USER_SUMMARY_KEYS = ('id', 'name', 'screen_name', 'profile_image_url', 'followers_count', 'following_count')
+_user_summary_getter = operator.attrgetter(*_USER_SUMMARY_KEYS)
+_TWEET_KEYS = ('id', 'text', 'created_at', 'favorite_count', 'retweet_count', 'reply_count')
+_tweet_getter = operator.attrgetter(*_TWEET_KEYS)
+# Media entries rename media_url to url, so the output keys and attributes differ
+_MEDIA_KEYS = ('type', 'url', 'width', 'height')
+_media_getter = operator.attrgetter('type', 'media_url', 'width', 'height')
+
+def format_user_summary(user) -> Dict[str, Any]:
+    """Format the short user listing returned for retweeters."""
+    return dict(zip(_USER_SUMMARY_KEYS, _user_summary_getter(user)))
+
+# Formatters specialized per twikit class. Which optional attributes exist is
+# fixed by the class, so it is probed once on the first object of each type.
+_USER_KEYS = ('id', 'name', 'screen_name', 'description', 'profile_image_url', 'followers_count',
+              'following_count', 'statuses_count', 'created_at', 'verified')
+_USER_OPTIONAL_DEFAULTS = {"location": None, "url": None, "protected": False}
+_USER_BUILDERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+_TWEET_BUILDERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+def _make_user_builder(user) -> Callable[[Any], Dict[str, Any]]:
+    """Build a formatter for users of the same class as `user`."""
+    present = tuple(name for name in _USER_OPTIONAL_DEFAULTS if hasattr(user, name))
+    keys = _USER_KEYS + present
+    getter = operator.attrgetter(*keys)
+    # Every key in output order, with defaults for the attributes this class lacks
+    template = dict.fromkeys(_USER_KEYS)
+    template.update(_USER_OPTIONAL_DEFAULTS)
+    
+    def build(user) -> Dict[str, Any]:
+        user_data = template.copy()
+        user_data.update(zip(keys, getter(user)))
+        return user_data
+    return build
+
+def _make_tweet_builder(tweet) -> Callable[[Any], Dict[str, Any]]:
+    """Build a formatter for tweets of the same class as `tweet`."""
+    keys = _TWEET_KEYS + (('quote_count',) if hasattr(tweet, 'quote_count') else ())
+    getter = operator.attrgetter(*keys)
+    has_view_count = hasattr(tweet, 'view_count')
+    has_user = hasattr(tweet, 'user')
+    has_media = hasattr(tweet, 'media')
+    
+    def build(tweet) -> Dict[str, Any]:
+        tweet_data = dict(zip(keys, getter(tweet)))
+        
+        # Read each optional attribute once; it is only emitted when truthy
+        if has_view_count:
+            view_count = tweet.view_count
+            if view_count:
+                tweet_data["view_count"] = view_count
+        
+        if has_user:
+            user = tweet.user
+            if user:
+                tweet_data["user"] = {
+                    "id": user.id,
+                    "name": user.name,
+                    "screen_name": user.screen_name,
+                    "profile_image_url": user.profile_image_url
+                }
+        
+        if has_media:
+            media_list = tweet.media
+            if media_list:
+                tweet_data["media"] = [dict(zip(_MEDIA_KEYS, _media_getter(media))) for media in media_list]
+        
+        return tweet_data
+    return build
+
 def format_user(user) -> Dict[str, Any]:
     """Format user object into a standard dictionary."""
-    return {
-        "id": user.id,
-        "name": user.name,
-        "screen_name": user.screen_name,
-        "description": user.description,
-        "profile_image_url": user.profile_image_url,
-        "followers_count": user.followers_count,
-        "following_count": user.following_count,
-        "statuses_count": user.statuses_count,
-        "created_at": user.created_at,
-        "verified": user.verified,
-        "location": user.location if hasattr(user, 'location') else None,
-        "url": user.url if hasattr(user, 'url') else None,
-        "protected": user.protected if hasattr(user, 'protected') else False
-    }
+    build = _USER_BUILDERS.get(type(user))
+    if build is None:
+        build = _USER_BUILDERS[type(user)] = _make_user_builder(user)
+    return build(user)
 
 def format_tweet(tweet) -> Dict[str, Any]:
     """Format tweet object into a standard dictionary."""
-    tweet_data = {
+    build = _TWEET_BUILDERS.get(type(tweet))
+    if build is None:
+        build = _TWEET_BUILDERS[type(tweet)] = _make_tweet_builder(tweet)
+    return build(tweet)
+
+# Batches at least this large are formatted in a worker thread; below it the
+# thread hop costs more than the formatting it would move off the loop
+_FORMAT_OFFLOAD_MIN = 32
+
+def _format_list(formatter: Callable[[Any], Dict[str, Any]], items) -> List[Dict[str, Any]]:
+    """Format every item of a twikit result."""
+    return [formatter(item) for item in items]
+
+async def format_all(formatter: Callable[[Any], Dict[str, Any]], items) -> List[Dict[str, Any]]:
+    """Format a twikit result, keeping large batches off the event loop."""
+    if len(items) >= _FORMAT_OFFLOAD_MIN:
+        return await asyncio.to_thread(_format_list, formatter, items)
+    return _format_list(formatter, items)
+
+def format_scheduled_tweet(tweet) -> Dict[str, Any]:
+    """Format a scheduled tweet into a standard dictionary."""
+    return {
         "id": tweet.id,
         "text": tweet.text,
-        "created_at": tweet.created_at,
-        "favorite_count": tweet.favorite_count,
-        "retweet_count": tweet.retweet_count,
-        "reply_count": tweet.reply_count
+        "scheduled_at": tweet.scheduled_at,
+        "media_ids": getattr(tweet, 'media_ids', [])
     }
-    
-    if hasattr(tweet, 'quote_count'):
-        tweet_data["quote_count"] = tweet.quote_count
-        
-    if hasattr(tweet, 'view_count') and tweet.view_count:
-        tweet_data["view_count"] = tweet.view_count
-    
-    if hasattr(tweet, 'user') and tweet.user:
-        tweet_data["user"] = {
-            "id": tweet.user.id,
-            "name": tweet.user.name,
-            "screen_name": tweet.user.screen_name,
-            "profile_image_url": tweet.user.profile_image_url
-        }
-    
-    if hasattr(tweet, 'media') and tweet.media:
-        tweet_data["media"] = [{
-            "type": media.type, 
-            "url": media.media_url,
-            "width": media.width,
-            "height": media.height
-        } for media in tweet.media]
-    
-    return tweet_data
+
+# ---- Lookup Caches ----
+
+# Recently fetched results, as {key: (expiry, formatted result)}. Follower
+# lists and trends change slowly, so they are kept a little longer.
+_USER_CACHE = CacheDict()
+_TWEET_CACHE = CacheDict()
+_FOLLOWERS_CACHE = CacheDict()
+_FOLLOWING_CACHE = CacheDict()
+_TRENDS_CACHE = CacheDict()
+_NETWORK_CACHE_TTL = 120.0
+_TRENDS_CACHE_TTL = 45.0
+
+@async_ttl_cache(_USER_CACHE)
+@single_flight
+async def _fetch_user_by_screen_name(client, screen_name: str) -> Dict[str, Any]:
+    """Fetch and format a user, reusing recent results for the same screen name."""
+    return format_user(await client.get_user_by_screen_name(screen_name))
+
+@async_ttl_cache(_TWEET_CACHE)
+@single_flight
+async def _fetch_tweet_by_id(client, tweet_id: str) -> Dict[str, Any]:
+    """Fetch and format a tweet, reusing recent results for the same ID."""
+    return format_tweet(await client.get_tweet_by_id(tweet_id))
+
+@single_flight
+async def _fetch_retweeters(client, tweet_id: str, count: int):
+    """Fetch the retweeters of a tweet, sharing concurrent identical requests."""
+    return await client.get_retweeters(tweet_id, count)
+
+@single_flight
+async def _fetch_user_tweets(client, user_id: str, tweet_type: str, count: int):
+    """Fetch a user's tweets, sharing concurrent identical requests."""
+    return await client.get_user_tweets(user_id, tweet_type, count)
+
+@async_ttl_cache(_FOLLOWERS_CACHE, ttl=_NETWORK_CACHE_TTL)
+@single_flight
+async def _fetch_user_followers(client, user_id: str, count: int) -> List[Dict[str, Any]]:
+    """Fetch and format a user's followers, reusing recent results."""
+    return await format_all(format_user, await client.get_user_followers(user_id, count))
+
+@async_ttl_cache(_FOLLOWING_CACHE, ttl=_NETWORK_CACHE_TTL)
+@single_flight
+async def _fetch_user_following(client, user_id: str, count: int) -> List[Dict[str, Any]]:
+    """Fetch and format the accounts a user follows, reusing recent results."""
+    return await format_all(format_user, await client.get_user_following(user_id, count))
+
+@async_ttl_cache(_TRENDS_CACHE, ttl=_TRENDS_CACHE_TTL)
+@single_flight
+async def _fetch_trends(client, category: str) -> List[Dict[str, Any]]:
+    """Fetch and format the trends for a category, reusing recent results."""
+    return [{
+        "name": trend.name,
+        "tweets_count": getattr(trend, 'tweets_count', None),
+        "domain_context": getattr(trend, 'domain_context', None)
+    } for trend in await client.get_trends(category)]
+
+@single_flight
+async def _fetch_dm_history(client, user_id: str, max_id: str = None):
+    """Fetch a DM conversation, sharing the request between concurrent callers."""
+    return await client.get_dm_history(user_id, max_id)
 
 # ---- Tweet Management Tools ----
 
 @mcp.tool()
-async def post_tweet(x_service, text: str) -> dict:
+async def post_tweet(x_service, text: NonEmptyStr) -> dict:
     """
     Post a tweet to the authenticated user's X timeline.
     
@@ -149,10 +434,8 @@ async def post_tweet(x_service, text: str) -> dict:
     if not text or not isinstance(text, str) or len(text.strip()) == 0:
         return {"status": "error", "message": "Tweet text cannot be empty"}
     
-    # Truncate text to 280 characters if needed
-    text = text.strip()
-    if len(text) > 280:
-        text = text[:280]
+    # Truncate text to 280 UTF-16 code units if needed
+    text = truncate_utf16(text.strip(), 280)
     
     # Check service status
     is_ready, error_response = check_x_service(x_service)
@@ -161,18 +444,17 @@ async def post_tweet(x_service, text: str) -> dict:
     
     # Post the tweet
     try:
-        print(f"[DEBUG] Attempting to post tweet: {text[:50]}...")
+        log.debug("Attempting to post tweet: %s...", text[:50])
         result = await x_service.post_tweet(text)
-        print(f"[DEBUG] Tweet posted successfully: {result.get('tweet_id', 'unknown')}")
+        log.debug("Tweet posted successfully: %s", result.get('tweet_id', 'unknown'))
         return result
     except Exception as e:
         error_msg = f"Failed to post tweet: {str(e)}"
-        print(f"[ERROR] {error_msg}")
-        traceback.print_exc()
-        return {"status": "error", "message": error_msg}
+        log_error("post_tweet", error_msg, e)
+        return exception_response(error_msg, e)
 
 @mcp.tool()
-async def search_tweets(x_service, query: str, count: int = 10, mode: str = 'Latest') -> dict:
+async def search_tweets(x_service, query: NonEmptyStr, count: int = 10, mode: SearchMode = 'Latest') -> dict:
     """
     Search for tweets matching a specific query.
     
@@ -212,12 +494,11 @@ async def search_tweets(x_service, query: str, count: int = 10, mode: str = 'Lat
         return {"status": "error", "message": "Search query cannot be empty"}
     
     # Validate mode
-    valid_modes = ['Latest', 'Top', 'People', 'Photos', 'Videos']
-    if mode not in valid_modes:
-        return {"status": "error", "message": f"Invalid mode. Must be one of: {', '.join(valid_modes)}"}
+    if mode not in _SEARCH_MODES:
+        return _INVALID_SEARCH_MODE_ERROR
     
     # Clamp count between 1 and 20
-    count = max(1, min(20, int(count) if str(count).isdigit() else 10))
+    count = validate_count(count, 1, 20, default=10)
     
     # Check service status
     is_ready, error_response = check_x_service(x_service)
@@ -226,20 +507,20 @@ async def search_tweets(x_service, query: str, count: int = 10, mode: str = 'Lat
     
     # Perform the search
     try:
-        print(f"[DEBUG] Searching for tweets with query: '{query}' (count: {count}, mode: {mode})")
+        log.debug("Searching for tweets with query: '%s' (count: %s, mode: %s)", query, count, mode)
         results = await x_service.search_tweets(query, count=count, mode=mode)
-        print(f"[DEBUG] Found {len(results.get('tweets', []))} tweets")
+        log.debug("Found %d tweets", len(results.get('tweets', [])))
         return results
     except Exception as e:
         error_msg = f"Error searching tweets: {str(e)}"
-        print(f"[ERROR] {error_msg}")
-        traceback.print_exc()
-        return {"status": "error", "message": error_msg}
+        log_error("search_tweets", error_msg, e)
+        return exception_response(error_msg, e)
 
 # ---- Additional Tweet Tools ----
 
 @mcp.tool()
-async def delete_tweet(x_service, tweet_id: str) -> dict:
+@x_tool("Failed to delete tweet", validate_ids=(("tweet_id", "Tweet ID"),))
+async def delete_tweet(x_service, tweet_id: NonEmptyStr) -> dict:
     """
     Delete a tweet from the authenticated user's timeline.
     
@@ -254,28 +535,15 @@ async def delete_tweet(x_service, tweet_id: str) -> dict:
     Example:
         Delete a specific tweet: "1234567890"
     """
-    # Validate input
-    is_valid, error = validate_id(tweet_id, "Tweet ID")
-    if not is_valid:
-        return error
-    
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Delete the tweet
-    try:
-        log_debug("delete_tweet", f"Attempting to delete tweet with ID: {tweet_id}")
-        response = await x_service._client.delete_tweet(tweet_id)
-        return {"status": "success", "message": "Tweet successfully deleted"}
-    except Exception as e:
-        error_msg = f"Failed to delete tweet: {str(e)}"
-        log_error("delete_tweet", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    log_debug("delete_tweet", "Attempting to delete tweet with ID: %s", tweet_id)
+    response = await x_service._client.delete_tweet(tweet_id)
+    invalidate_cache(_TWEET_CACHE, tweet_id)
+    return TWEET_DELETED_RESPONSE
 
 @mcp.tool()
-async def get_tweet_by_id(x_service, tweet_id: str) -> dict:
+@x_tool("Failed to retrieve tweet", validate_ids=(("tweet_id", "Tweet ID"),))
+async def get_tweet_by_id(x_service, tweet_id: NonEmptyStr) -> dict:
     """
     Retrieve a specific tweet by its ID.
     
@@ -291,36 +559,19 @@ async def get_tweet_by_id(x_service, tweet_id: str) -> dict:
     Example:
         Get details of a specific tweet: "1234567890"
     """
-    # Validate input
-    is_valid, error = validate_id(tweet_id, "Tweet ID")
-    if not is_valid:
-        return error
-    
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Get the tweet
-    try:
-        log_debug("get_tweet_by_id", f"Retrieving tweet with ID: {tweet_id}")
-        tweet = await x_service._client.get_tweet_by_id(tweet_id)
-        
-        # Format the tweet data using helper function
-        formatted_tweet = format_tweet(tweet)
-        
-        return {
-            "status": "success",
-            "message": "Successfully retrieved tweet",
-            "tweet": formatted_tweet
-        }
-    except Exception as e:
-        error_msg = f"Failed to retrieve tweet: {str(e)}"
-        log_error("get_tweet_by_id", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    log_debug("get_tweet_by_id", "Retrieving tweet with ID: %s", tweet_id)
+    # Fetch and format the tweet (served from cache for repeat lookups)
+    formatted_tweet = await _fetch_tweet_by_id(x_service._client, tweet_id)
+    
+    return {
+        "status": "success",
+        "message": "Successfully retrieved tweet",
+        "tweet": formatted_tweet
+    }
 
 @mcp.tool()
-async def create_tweet_with_poll(x_service, text: str, choices: List[str], duration_minutes: int = 1440) -> dict:
+async def create_tweet_with_poll(x_service, text: NonEmptyStr, choices: List[str], duration_minutes: int = 1440) -> dict:
     """
     Create a tweet with a poll.
     
@@ -371,10 +622,10 @@ async def create_tweet_with_poll(x_service, text: str, choices: List[str], durat
     
     # Create poll and tweet
     try:
-        log_debug("create_tweet_with_poll", f"Creating poll with {len(choices)} choices and duration {duration_minutes} minutes")
+        log_debug("create_tweet_with_poll", "Creating poll with %s choices and duration %s minutes", len(choices), duration_minutes)
         poll_uri = await x_service._client.create_poll(choices, duration_minutes)
         
-        log_debug("create_tweet_with_poll", f"Creating tweet with poll_uri: {poll_uri}")
+        log_debug("create_tweet_with_poll", "Creating tweet with poll_uri: %s", poll_uri)
         tweet = await x_service._client.create_tweet(text=text, poll_uri=poll_uri)
         
         return {
@@ -385,13 +636,14 @@ async def create_tweet_with_poll(x_service, text: str, choices: List[str], durat
     except Exception as e:
         error_msg = f"Failed to create tweet with poll: {str(e)}"
         log_error("create_tweet_with_poll", error_msg, e)
-        return {"status": "error", "message": error_msg}
+        return exception_response(error_msg, e)
 
 # More tools will be implemented here...
 
 # ---- Schedule and Engagement Tools ----
 
 @mcp.tool()
+@x_tool("Failed to retrieve scheduled tweets")
 async def get_scheduled_tweets(x_service) -> dict:
     """
     Retrieve all scheduled tweets for the authenticated user.
@@ -405,38 +657,21 @@ async def get_scheduled_tweets(x_service) -> dict:
     Example:
         View all scheduled tweets: (no parameters needed)
     """
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Get scheduled tweets
-    try:
-        log_debug("get_scheduled_tweets", "Retrieving scheduled tweets")
-        scheduled_tweets = await x_service._client.get_scheduled_tweets()
-        
-        # Format the results
-        formatted_tweets = []
-        for tweet in scheduled_tweets:
-            formatted_tweets.append({
-                "id": tweet.id,
-                "text": tweet.text,
-                "scheduled_at": tweet.scheduled_at,
-                "media_ids": tweet.media_ids if hasattr(tweet, 'media_ids') else []
-            })
-        
-        return {
-            "status": "success",
-            "message": f"Successfully retrieved {len(formatted_tweets)} scheduled tweets",
-            "tweets": formatted_tweets
-        }
-    except Exception as e:
-        error_msg = f"Failed to retrieve scheduled tweets: {str(e)}"
-        log_error("get_scheduled_tweets", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    log_debug("get_scheduled_tweets", "Retrieving scheduled tweets")
+    scheduled_tweets = await x_service._client.get_scheduled_tweets()
+    
+    # Format the results
+    formatted_tweets = await format_all(format_scheduled_tweet, scheduled_tweets)
+    
+    return {
+        "status": "success",
+        "message": f"Successfully retrieved {len(formatted_tweets)} scheduled tweets",
+        "tweets": formatted_tweets
+    }
 
 @mcp.tool()
-async def create_scheduled_tweet(x_service, text: str, scheduled_at: int, media_ids: List[str] = None) -> dict:
+async def create_scheduled_tweet(x_service, text: NonEmptyStr, scheduled_at: int, media_ids: List[str] = None) -> dict:
     """
     Schedule a tweet to be posted at a specific time.
     
@@ -462,16 +697,16 @@ async def create_scheduled_tweet(x_service, text: str, scheduled_at: int, media_
         return result
     text = result["text"]
     
-    # Validate scheduled_at
-    try:
-        scheduled_at = int(scheduled_at)
-        current_time = int(time.time())
-        
-        # Ensure scheduled time is in the future
-        if scheduled_at <= current_time:
-            return {"status": "error", "message": "Scheduled time must be in the future"}
-    except (ValueError, TypeError):
-        return {"status": "error", "message": "Scheduled time must be a valid Unix timestamp (in seconds)"}
+    # Validate scheduled_at (ints, the usual case, need no conversion)
+    if type(scheduled_at) is not int:
+        try:
+            scheduled_at = int(scheduled_at)
+        except (ValueError, TypeError):
+            return _INVALID_SCHEDULE_TIME_ERROR
+    
+    # Ensure scheduled time is in the future
+    if scheduled_at <= time.time():
+        return _PAST_SCHEDULE_TIME_ERROR
     
     # Validate media_ids if provided
     if media_ids and not isinstance(media_ids, list):
@@ -484,7 +719,7 @@ async def create_scheduled_tweet(x_service, text: str, scheduled_at: int, media_
     
     # Create scheduled tweet
     try:
-        log_debug("create_scheduled_tweet", f"Scheduling tweet for timestamp {scheduled_at}")
+        log_debug("create_scheduled_tweet", "Scheduling tweet for timestamp %s", scheduled_at)
         tweet_id = await x_service._client.create_scheduled_tweet(
             scheduled_at=scheduled_at,
             text=text,
@@ -499,10 +734,11 @@ async def create_scheduled_tweet(x_service, text: str, scheduled_at: int, media_
     except Exception as e:
         error_msg = f"Failed to schedule tweet: {str(e)}"
         log_error("create_scheduled_tweet", error_msg, e)
-        return {"status": "error", "message": error_msg}
+        return exception_response(error_msg, e)
 
 @mcp.tool()
-async def unfavorite_tweet(x_service, tweet_id: str) -> dict:
+@x_tool("Failed to unlike tweet", validate_ids=(("tweet_id", "Tweet ID"),))
+async def unfavorite_tweet(x_service, tweet_id: NonEmptyStr) -> dict:
     """
     Unlike/unfavorite a tweet.
     
@@ -517,28 +753,15 @@ async def unfavorite_tweet(x_service, tweet_id: str) -> dict:
     Example:
         Unlike a previously liked tweet: "1234567890"
     """
-    # Validate input
-    is_valid, error = validate_id(tweet_id, "Tweet ID")
-    if not is_valid:
-        return error
-    
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Unlike the tweet
-    try:
-        log_debug("unfavorite_tweet", f"Unliking tweet with ID: {tweet_id}")
-        await x_service._client.unfavorite_tweet(tweet_id)
-        return {"status": "success", "message": "Successfully unliked tweet"}
-    except Exception as e:
-        error_msg = f"Failed to unlike tweet: {str(e)}"
-        log_error("unfavorite_tweet", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    log_debug("unfavorite_tweet", "Unliking tweet with ID: %s", tweet_id)
+    await x_service._client.unfavorite_tweet(tweet_id)
+    invalidate_cache(_TWEET_CACHE, tweet_id)
+    return TWEET_UNLIKED_RESPONSE
 
 @mcp.tool()
-async def retweet(x_service, tweet_id: str) -> dict:
+@x_tool("Failed to retweet", validate_ids=(("tweet_id", "Tweet ID"),))
+async def retweet(x_service, tweet_id: NonEmptyStr) -> dict:
     """
     Retweet a tweet.
     
@@ -553,28 +776,16 @@ async def retweet(x_service, tweet_id: str) -> dict:
     Example:
         Retweet an interesting post: "1234567890"
     """
-    # Validate input
-    is_valid, error = validate_id(tweet_id, "Tweet ID")
-    if not is_valid:
-        return error
-    
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Retweet the tweet
-    try:
-        log_debug("retweet", f"Retweeting tweet with ID: {tweet_id}")
-        await x_service._client.retweet(tweet_id)
-        return {"status": "success", "message": "Successfully retweeted tweet"}
-    except Exception as e:
-        error_msg = f"Failed to retweet: {str(e)}"
-        log_error("retweet", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    log_debug("retweet", "Retweeting tweet with ID: %s", tweet_id)
+    await x_service._client.retweet(tweet_id)
+    invalidate_cache(_TWEET_CACHE, tweet_id)
+    return TWEET_RETWEETED_RESPONSE
 
 @mcp.tool()
-async def get_retweeters(x_service, tweet_id: str, count: int = 20) -> dict:
+@x_tool("Failed to get retweeters", validate_ids=(("tweet_id", "Tweet ID"),),
+         counts=(("count", *_RETWEETER_COUNT_BOUNDS),))
+async def get_retweeters(x_service, tweet_id: NonEmptyStr, count: int = 20) -> dict:
     """
     Get a list of users who retweeted a specific tweet.
     
@@ -591,50 +802,23 @@ async def get_retweeters(x_service, tweet_id: str, count: int = 20) -> dict:
     Example:
         Find who retweeted a viral post: "1234567890" count=30
     """
-    # Validate input
-    is_valid, error = validate_id(tweet_id, "Tweet ID")
-    if not is_valid:
-        return error
-    
-    # Normalize count
-    count = validate_count(count, 1, 40)
-    
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Get retweeters
-    try:
-        log_debug("get_retweeters", f"Getting retweeters for tweet ID: {tweet_id}, count: {count}")
-        users_result = await x_service._client.get_retweeters(tweet_id, count)
+    log_debug("get_retweeters", "Getting retweeters for tweet ID: %s, count: %s", tweet_id, count)
+    users_result = await _fetch_retweeters(x_service._client, tweet_id, count)
+    
+    # Format the users
+    formatted_users = await format_all(format_user_summary, users_result)
         
-        # Format the users
-        formatted_users = []
-        for user in users_result:
-            formatted_users.append({
-                "id": user.id,
-                "name": user.name,
-                "screen_name": user.screen_name,
-                "profile_image_url": user.profile_image_url,
-                "followers_count": user.followers_count,
-                "following_count": user.following_count
-            })
-            
-        return {
-            "status": "success", 
-            "message": f"Successfully retrieved {len(formatted_users)} retweeters",
-            "users": formatted_users
-        }
-    except Exception as e:
-        error_msg = f"Failed to get retweeters: {str(e)}"
-        log_error("get_retweeters", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    return {
+        "status": "success", 
+        "message": f"Successfully retrieved {len(formatted_users)} retweeters",
+        "users": formatted_users
+    }
 
 # ---- User Tools ----
 
 @mcp.tool()
-async def get_user_by_screen_name(x_service, screen_name: str) -> dict:
+async def get_user_by_screen_name(x_service, screen_name: NonEmptyStr) -> dict:
     """
     Get user information by their screen name (handle).
     
@@ -668,11 +852,9 @@ async def get_user_by_screen_name(x_service, screen_name: str) -> dict:
     
     # Get user
     try:
-        log_debug("get_user_by_screen_name", f"Getting user with screen name: {screen_name}")
-        user = await x_service._client.get_user_by_screen_name(screen_name)
-        
-        # Format user data using helper function
-        formatted_user = format_user(user)
+        log_debug("get_user_by_screen_name", "Getting user with screen name: %s", screen_name)
+        # Fetch and format the user (served from cache for repeat lookups)
+        formatted_user = await _fetch_user_by_screen_name(x_service._client, screen_name)
         
         return {
             "status": "success",
@@ -682,10 +864,12 @@ async def get_user_by_screen_name(x_service, screen_name: str) -> dict:
     except Exception as e:
         error_msg = f"Failed to get user: {str(e)}"
         log_error("get_user_by_screen_name", error_msg, e)
-        return {"status": "error", "message": error_msg}
+        return exception_response(error_msg, e)
 
 @mcp.tool()
-async def get_user_tweets(x_service, user_id: str, tweet_type: TweetType = 'Tweets', count: int = 20) -> dict:
+@x_tool("Failed to get user tweets", validate_ids=(("user_id", "User ID"),),
+         counts=(("count", *_USER_TWEET_COUNT_BOUNDS),), modes=(("tweet_type", _TWEET_TYPE_NAMES),))
+async def get_user_tweets(x_service, user_id: NonEmptyStr, tweet_type: TweetType = 'Tweets', count: int = 20) -> dict:
     """
     Get tweets from a specific user.
     
@@ -711,48 +895,28 @@ async def get_user_tweets(x_service, user_id: str, tweet_type: TweetType = 'Twee
         
         Get liked tweets from a user: "44196397" tweet_type=Likes
     """
-    # Validate input
-    is_valid, error = validate_id(user_id, "User ID")
-    if not is_valid:
-        return error
-    
-    # Validate tweet_type
-    valid_types = ['Tweets', 'Replies', 'Media', 'Likes']
-    is_valid, error = validate_mode(tweet_type, valid_types)
-    if not is_valid:
-        return error
-    
-    # Normalize count
-    count = validate_count(count, 1, 100)
+    return await _get_user_tweets_impl(x_service, user_id, tweet_type, count)
+
+async def _get_user_tweets_impl(x_service, user_id: str, tweet_type: str, count: int) -> dict:
+    """Fetch and format a user's tweets; the caller has already validated the arguments."""
+    # Get tweets
+    log_debug("get_user_tweets", "Getting %s for user: %s, count: %s", tweet_type, user_id, count)
+    tweets_result = await _fetch_user_tweets(x_service._client, user_id, tweet_type, count)
     
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
+    # Format tweets
+    formatted_tweets = await format_all(format_tweet, tweets_result)
     
-    # Get tweets
-    try:
-        log_debug("get_user_tweets", f"Getting {tweet_type} for user: {user_id}, count: {count}")
-        tweets_result = await x_service._client.get_user_tweets(user_id, tweet_type, count)
-        
-        # Format tweets
-        formatted_tweets = []
-        for tweet in tweets_result:
-            formatted_tweets.append(format_tweet(tweet))
-        
-        return {
-            "status": "success",
-            "message": f"Successfully retrieved {len(formatted_tweets)} {tweet_type.lower()}",
-            "tweets": formatted_tweets,
-            "cursor": tweets_result.next_cursor if hasattr(tweets_result, 'next_cursor') else None
-        }
-    except Exception as e:
-        error_msg = f"Failed to get user tweets: {str(e)}"
-        log_error("get_user_tweets", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    return {
+        "status": "success",
+        "message": f"Successfully retrieved {len(formatted_tweets)} {tweet_type.lower()}",
+        "tweets": formatted_tweets,
+        "cursor": getattr(tweets_result, 'next_cursor', None)
+    }
 
 @mcp.tool()
-async def get_user_media(x_service, user_id: str, count: int = 20) -> dict:
+@x_tool("Failed to get user tweets", validate_ids=(("user_id", "User ID"),),
+         counts=(("count", *_USER_TWEET_COUNT_BOUNDS),))
+async def get_user_media(x_service, user_id: NonEmptyStr, count: int = 20) -> dict:
     """
     Get media tweets from a specific user.
     
@@ -769,11 +933,13 @@ async def get_user_media(x_service, user_id: str, count: int = 20) -> dict:
     Example:
         Get photos and videos from NASA: "11348282" count=30
     """
-    # This is a convenience wrapper around get_user_tweets with tweet_type='Media'
-    return await get_user_tweets(x_service, user_id, 'Media', count)
+    # Same as get_user_tweets with tweet_type='Media'
+    return await _get_user_tweets_impl(x_service, user_id, 'Media', count)
 
 @mcp.tool()
-async def get_user_likes(x_service, user_id: str, count: int = 20) -> dict:
+@x_tool("Failed to get user tweets", validate_ids=(("user_id", "User ID"),),
+         counts=(("count", *_USER_TWEET_COUNT_BOUNDS),))
+async def get_user_likes(x_service, user_id: NonEmptyStr, count: int = 20) -> dict:
     """
     Get tweets liked by a specific user.
     
@@ -790,13 +956,14 @@ async def get_user_likes(x_service, user_id: str, count: int = 20) -> dict:
     Example:
         See what tweets a user has liked recently: "783214" count=25
     """
-    # This is a convenience wrapper around get_user_tweets with tweet_type='Likes'
-    return await get_user_tweets(x_service, user_id, 'Likes', count)
+    # Same as get_user_tweets with tweet_type='Likes'
+    return await _get_user_tweets_impl(x_service, user_id, 'Likes', count)
 
 # ---- User Interaction Tools ----
 
 @mcp.tool()
-async def follow_user(x_service, user_id: str) -> dict:
+@x_tool("Failed to follow user", validate_ids=(("user_id", "User ID"),))
+async def follow_user(x_service, user_id: NonEmptyStr) -> dict:
     """
     Follow a user on X.
     
@@ -812,36 +979,36 @@ async def follow_user(x_service, user_id: str) -> dict:
     Example:
         Follow a specific account: "11348282"
     """
-    # Validate input
-    is_valid, error = validate_id(user_id, "User ID")
-    if not is_valid:
-        return error
-    
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Follow the user
+    log_debug("follow_user", "Following user with ID: %s", user_id)
+    user = await x_service._client.follow_user(user_id)
+    
+    # The user's followers and our own following list have changed, and so have
+    # both profiles' counts; the user cache is keyed by screen name, so match its
+    # entries by the cached user's ID
     try:
-        log_debug("follow_user", f"Following user with ID: {user_id}")
-        user = await x_service._client.follow_user(user_id)
-        
-        # Format the user data
-        formatted_user = format_user(user)
-        
-        return {
-            "status": "success",
-            "message": f"Successfully followed @{user.screen_name}",
-            "user": formatted_user
-        }
+        own_id = await x_service._client.user_id()
     except Exception as e:
-        error_msg = f"Failed to follow user: {str(e)}"
-        log_error("follow_user", error_msg, e)
-        return {"status": "error", "message": error_msg}
+        # The follow went through; without our own ID, drop every following list
+        log_error("follow_user", "Could not get the authenticated user's ID", e)
+        own_id = None
+    invalidate_cache(_FOLLOWERS_CACHE, user_id)
+    invalidate_cache(_FOLLOWING_CACHE, own_id)
+    invalidate_results(_USER_CACHE, lambda cached: cached.get("id") in (user_id, own_id))
+    
+    # Format the user data
+    formatted_user = format_user(user)
+    
+    return {
+        "status": "success",
+        "message": f"Successfully followed @{user.screen_name}",
+        "user": formatted_user
+    }
 
 @mcp.tool()
-async def get_user_followers(x_service, user_id: str, count: int = 20) -> dict:
+@x_tool("Failed to get followers", validate_ids=(("user_id", "User ID"),),
+         counts=(("count", *_FOLLOWER_COUNT_BOUNDS),))
+async def get_user_followers(x_service, user_id: NonEmptyStr, count: int = 20) -> dict:
     """
     Get a list of followers for a specific user.
     
@@ -858,41 +1025,21 @@ async def get_user_followers(x_service, user_id: str, count: int = 20) -> dict:
     Example:
         See who follows a specific account: "783214" count=40
     """
-    # Validate input
-    is_valid, error = validate_id(user_id, "User ID")
-    if not is_valid:
-        return error
-    
-    # Normalize count
-    count = validate_count(count, 1, 50)
-    
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Get followers
-    try:
-        log_debug("get_user_followers", f"Getting followers for user: {user_id}, count: {count}")
-        users_result = await x_service._client.get_user_followers(user_id, count)
-        
-        # Format the users
-        formatted_users = []
-        for user in users_result:
-            formatted_users.append(format_user(user))
-        
-        return {
-            "status": "success",
-            "message": f"Successfully retrieved {len(formatted_users)} followers",
-            "users": formatted_users
-        }
-    except Exception as e:
-        error_msg = f"Failed to get followers: {str(e)}"
-        log_error("get_user_followers", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    log_debug("get_user_followers", "Getting followers for user: %s, count: %s", user_id, count)
+    # Fetch and format the users (served from cache for repeat lookups)
+    formatted_users = await _fetch_user_followers(x_service._client, user_id, count)
+    
+    return {
+        "status": "success",
+        "message": f"Successfully retrieved {len(formatted_users)} followers",
+        "users": formatted_users
+    }
 
 @mcp.tool()
-async def get_user_following(x_service, user_id: str, count: int = 20) -> dict:
+@x_tool("Failed to get following", validate_ids=(("user_id", "User ID"),),
+         counts=(("count", *_FOLLOWER_COUNT_BOUNDS),))
+async def get_user_following(x_service, user_id: NonEmptyStr, count: int = 20) -> dict:
     """
     Get a list of users that a specific user is following.
     
@@ -909,54 +1056,154 @@ async def get_user_following(x_service, user_id: str, count: int = 20) -> dict:
     Example:
         See who a specific account follows: "783214" count=30
     """
-    # Validate input
-    is_valid, error = validate_id(user_id, "User ID")
-    if not is_valid:
-        return error
+    # Get following
+    log_debug("get_user_following", "Getting following for user: %s, count: %s", user_id, count)
+    # Fetch and format the users (served from cache for repeat lookups)
+    formatted_users = await _fetch_user_following(x_service._client, user_id, count)
     
-    # Normalize count
-    count = validate_count(count, 1, 50)
+    return {
+        "status": "success",
+        "message": f"Successfully retrieved {len(formatted_users)} following",
+        "users": formatted_users
+    }
+
+@mcp.tool()
+@x_tool("Failed to get user network", validate_ids=(("user_id", "User ID"),),
+         counts=(("count", *_FOLLOWER_COUNT_BOUNDS),))
+async def get_user_network(x_service, user_id: NonEmptyStr, count: int = 20) -> dict:
+    """
+    Get both the followers and the following list of a user in one call.
     
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
+    The two lists are fetched concurrently. If one of them fails, the other is
+    still returned and the failure is reported under "errors".
     
-    # Get following
-    try:
-        log_debug("get_user_following", f"Getting following for user: {user_id}, count: {count}")
-        users_result = await x_service._client.get_user_following(user_id, count)
-        
-        # Format the users
-        formatted_users = []
-        for user in users_result:
-            formatted_users.append(format_user(user))
-        
-        return {
-            "status": "success",
-            "message": f"Successfully retrieved {len(formatted_users)} following",
-            "users": formatted_users
-        }
-    except Exception as e:
-        error_msg = f"Failed to get following: {str(e)}"
-        log_error("get_user_following", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    Args:
+        user_id (str): The ID of the user.
+        count (int, optional): The number of users to retrieve for each list. Default is 20.
+    
+    Returns:
+        dict: A dictionary containing:
+            - status (str): "success" or "error"
+            - message (str): Description of the result
+            - followers (list, optional): List of follower users
+            - following (list, optional): List of users being followed
+            - errors (dict, optional): Error messages for lists that could not be retrieved
+    
+    Example:
+        See who follows and is followed by an account: "783214" count=30
+    """
+    # Get followers and following concurrently
+    log_debug("get_user_network", "Getting network for user: %s, count: %s", user_id, count)
+    followers, following = await asyncio.gather(
+        _fetch_user_followers(x_service._client, user_id, count),
+        _fetch_user_following(x_service._client, user_id, count),
+        return_exceptions=True
+    )
+    
+    errors = {}
+    for name, result in (("followers", followers), ("following", following)):
+        if isinstance(result, BaseException):
+            log_error("get_user_network", f"Failed to get {name}: {str(result)}", result)
+            errors[name] = str(result)
+    if len(errors) == 2:
+        return {"status": "error", "message": f"Failed to get user network: {errors['followers']}", "errors": errors}
+    
+    response = {
+        "status": "success",
+        "message": "Successfully retrieved user network",
+        "followers": None if "followers" in errors else followers,
+        "following": None if "following" in errors else following
+    }
+    if errors:
+        response["errors"] = errors
+    return response
+
+# Limits for get_users_followers_batch; requests are capped to stay within rate limits
+_FOLLOWERS_BATCH_MAX_USERS = 20
+_FOLLOWERS_BATCH_CONCURRENCY = 5
+
+@mcp.tool()
+@x_tool("Failed to get followers", counts=(("count", *_FOLLOWER_COUNT_BOUNDS),))
+async def get_users_followers_batch(x_service, user_ids: List[NonEmptyStr], count: int = 20) -> dict:
+    """
+    Get the followers of several users in one call.
+    
+    The lookups run concurrently (at most 5 at a time). Each user gets its own
+    result entry, so one failed lookup doesn't fail the whole batch.
+    
+    Args:
+        user_ids (list): The IDs of the users (1-20 IDs).
+        count (int, optional): The number of followers to retrieve per user. Default is 20.
+    
+    Returns:
+        dict: A dictionary containing:
+            - status (str): "success" or "error"
+            - message (str): Description of the result
+            - results (list, optional): One entry per user ID, in order, with
+              user_id, status, and users or message
+    
+    Example:
+        Compare the followers of two accounts: ["783214", "44196397"] count=10
+    """
+    if not isinstance(user_ids, list) or not user_ids:
+        return {"status": "error", "message": "user_ids must be a non-empty list"}
+    if len(user_ids) > _FOLLOWERS_BATCH_MAX_USERS:
+        return {"status": "error", "message": f"At most {_FOLLOWERS_BATCH_MAX_USERS} user IDs can be requested at once"}
+    
+    log_debug("get_users_followers_batch", "Getting followers for %s users, count: %s", len(user_ids), count)
+    semaphore = asyncio.Semaphore(_FOLLOWERS_BATCH_CONCURRENCY)
+    
+    async def fetch(user_id) -> dict:
+        is_valid, error_response = validate_id(user_id, "User ID")
+        if not is_valid:
+            return {"user_id": user_id, **error_response}
+        try:
+            async with semaphore:
+                users = await _fetch_user_followers(x_service._client, user_id, count)
+        except Exception as e:
+            error_msg = f"Failed to get followers: {str(e)}"
+            log_error("get_users_followers_batch", error_msg, e)
+            return {"user_id": user_id, "status": "error", "message": error_msg}
+        return {"user_id": user_id, "status": "success", "users": users}
+    
+    results = await asyncio.gather(*[fetch(user_id) for user_id in user_ids])
+    
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    return {
+        "status": "success",
+        "message": f"Retrieved followers for {succeeded} of {len(results)} users",
+        "results": results
+    }
 
 # ---- Direct Message Tools ----
 
+def _log_queued_dm_result(future: asyncio.Future):
+    """Report the outcome of a DM queued without waiting."""
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        log_error("send_dm", f"Failed to send queued direct message: {str(error)}", error)
+
 @mcp.tool()
-async def send_dm(x_service, user_id: str, text: str, media_id: str = None) -> dict:
+@x_tool("Failed to send direct message", validate_ids=(("user_id", "User ID"),))
+async def send_dm(x_service, user_id: NonEmptyStr, text: NonEmptyStr, media_id: str = None, wait: bool = True) -> dict:
     """
     Send a direct message to a user.
     
+    Messages are sent by a background worker: messages to the same user are
+    delivered in order, while messages to different users go out in parallel.
+    
     Args:
         user_id (str): The ID of the user to whom the direct message will be sent.
         text (str): The text content of the direct message.
         media_id (str, optional): The media ID associated with any media content to be included.
+        wait (bool, optional): Wait until the message is sent and return its ID. If False,
+            return as soon as the message is queued. Default is True.
     
     Returns:
         dict: A dictionary containing:
-            - status (str): "success" or "error"
+            - status (str): "success", "accepted" (queued, when wait is False) or "error"
             - message (str): Description of the result
             - dm_id (str, optional): The ID of the sent message
     
@@ -964,12 +1211,9 @@ async def send_dm(x_service, user_id: str, text: str, media_id: str = None) -> d
         Send a simple message: "783214" text="Hello, how are you?"
         
         Send a message with an image: "44196397" text="Check out this photo!" media_id="1234567890"
+        
+        Queue a message without waiting: "783214" text="Reminder: meeting at 3pm" wait=False
     """
-    # Validate input
-    is_valid, error = validate_id(user_id, "User ID")
-    if not is_valid:
-        return error
-    
     # Validate text
     is_valid, result = validate_text(text, max_length=10000)  # DMs can be longer than tweets
     if not is_valid:
@@ -980,28 +1224,27 @@ async def send_dm(x_service, user_id: str, text: str, media_id: str = None) -> d
     if media_id and not isinstance(media_id, str):
         return {"status": "error", "message": "Media ID must be a string"}
     
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Send the DM
-    try:
-        log_debug("send_dm", f"Sending DM to user: {user_id}")
+    log_debug("send_dm", "Sending DM to user: %s", user_id)
+    dm_sender = getattr(x_service, 'dm_sender', None)
+    if dm_sender is None:
         message = await x_service._client.send_dm(user_id, text, media_id)
-        
-        return {
-            "status": "success",
-            "message": "Successfully sent direct message",
-            "dm_id": message.id
-        }
-    except Exception as e:
-        error_msg = f"Failed to send direct message: {str(e)}"
-        log_error("send_dm", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    else:
+        future = dm_sender.submit(user_id, text, media_id)
+        if not wait:
+            future.add_done_callback(_log_queued_dm_result)
+            return QUEUED_DM_RESPONSE
+        message = await future
+    
+    return {
+        "status": "success",
+        "message": "Successfully sent direct message",
+        "dm_id": message.id
+    }
 
 @mcp.tool()
-async def get_dm_history(x_service, user_id: str, max_id: str = None) -> dict:
+@x_tool("Failed to get DM history", validate_ids=(("user_id", "User ID"),))
+async def get_dm_history(x_service, user_id: NonEmptyStr, max_id: str = None) -> dict:
     """
     Retrieve the direct message conversation history with a specific user.
     
@@ -1020,45 +1263,29 @@ async def get_dm_history(x_service, user_id: str, max_id: str = None) -> dict:
         
         Get older messages: "44196397" max_id="1234567890"
     """
-    # Validate input
-    is_valid, error = validate_id(user_id, "User ID")
-    if not is_valid:
-        return error
-    
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Get DM history
-    try:
-        log_debug("get_dm_history", f"Getting DM history with user: {user_id}")
-        messages_result = await x_service._client.get_dm_history(user_id, max_id)
-        
-        # Format the messages
-        formatted_messages = []
-        for msg in messages_result:
-            formatted_messages.append({
-                "id": msg.id,
-                "text": msg.text,
-                "time": msg.time,
-                "sender_id": msg.sender_id if hasattr(msg, 'sender_id') else None,
-                "attachment": msg.attachment if hasattr(msg, 'attachment') else None
-            })
-        
-        return {
-            "status": "success",
-            "message": f"Successfully retrieved {len(formatted_messages)} messages",
-            "messages": formatted_messages,
-            "cursor": messages_result.next_cursor if hasattr(messages_result, 'next_cursor') else None
-        }
-    except Exception as e:
-        error_msg = f"Failed to get DM history: {str(e)}"
-        log_error("get_dm_history", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    log_debug("get_dm_history", "Getting DM history with user: %s", user_id)
+    messages_result = await _fetch_dm_history(x_service._client, user_id, max_id)
+    
+    # Format the messages
+    formatted_messages = [{
+        "id": msg.id,
+        "text": msg.text,
+        "time": msg.time,
+        "sender_id": getattr(msg, 'sender_id', None),
+        "attachment": getattr(msg, 'attachment', None)
+    } for msg in messages_result]
+    
+    return {
+        "status": "success",
+        "message": f"Successfully retrieved {len(formatted_messages)} messages",
+        "messages": formatted_messages,
+        "cursor": getattr(messages_result, 'next_cursor', None)
+    }
 
 @mcp.tool()
-async def delete_dm(x_service, message_id: str) -> dict:
+@x_tool("Failed to delete direct message", validate_ids=(("message_id", "Message ID"),))
+async def delete_dm(x_service, message_id: NonEmptyStr) -> dict:
     """
     Delete a direct message.
     
@@ -1073,33 +1300,16 @@ async def delete_dm(x_service, message_id: str) -> dict:
     Example:
         Delete a specific direct message: "1234567890"
     """
-    # Validate input
-    is_valid, error = validate_id(message_id, "Message ID")
-    if not is_valid:
-        return error
-    
-    # Check service status
-    is_ready, error_response = check_x_service(x_service)
-    if not is_ready:
-        return error_response
-    
     # Delete the DM
-    try:
-        log_debug("delete_dm", f"Deleting DM with ID: {message_id}")
-        await x_service._client.delete_dm(message_id)
-        
-        return {
-            "status": "success",
-            "message": "Successfully deleted direct message"
-        }
-    except Exception as e:
-        error_msg = f"Failed to delete direct message: {str(e)}"
-        log_error("delete_dm", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    log_debug("delete_dm", "Deleting DM with ID: %s", message_id)
+    await x_service._client.delete_dm(message_id)
+    
+    return DM_DELETED_RESPONSE
 
 # ---- Trending Tools ----
 
 @mcp.tool()
+@x_tool("Failed to get trends", modes=(("category", _TREND_CATEGORY_NAMES),))
 async def get_trends(x_service, category: TrendType = 'trending') -> dict:
     """
     Get trending topics on X.
@@ -1125,37 +1335,153 @@ async def get_trends(x_service, category: TrendType = 'trending') -> dict:
         
         Get entertainment trends: category="entertainment"
     """
-    # Validate category
-    valid_categories = ['trending', 'for-you', 'news', 'sports', 'entertainment']
-    is_valid, error = validate_mode(category, valid_categories)
-    if not is_valid:
-        return error
+    # Get trends
+    log_debug("get_trends", "Getting trends for category: %s", category)
+    # Fetch and format the trends (served from cache for repeat lookups)
+    formatted_trends = await _fetch_trends(x_service._client, category)
+    
+    return {
+        "status": "success",
+        "message": f"Successfully retrieved {len(formatted_trends)} {category} trends",
+        "trends": formatted_trends
+    }
+
+@mcp.tool()
+@x_tool("Failed to get trends")
+async def get_all_trends(x_service) -> dict:
+    """
+    Get trending topics for every category in one call.
+    
+    All categories are fetched concurrently. If some of them fail, the others
+    are still returned and the failures are reported under "errors".
+    
+    Returns:
+        dict: A dictionary containing:
+            - status (str): "success" or "error"
+            - message (str): Description of the result
+            - trends_by_category (dict, optional): Trending topics keyed by category
+            - errors (dict, optional): Error messages for categories that could not be retrieved
+    
+    Example:
+        Get an overview of everything trending: (no arguments)
+    """
+    log_debug("get_all_trends", "Getting trends for all categories")
+    results = await asyncio.gather(
+        *[_fetch_trends(x_service._client, category) for category in _TREND_CATEGORY_NAMES],
+        return_exceptions=True
+    )
+    
+    trends_by_category = {}
+    errors = {}
+    for category, result in zip(_TREND_CATEGORY_NAMES, results):
+        if isinstance(result, BaseException):
+            log_error("get_all_trends", f"Failed to get {category} trends: {str(result)}", result)
+            errors[category] = str(result)
+        else:
+            trends_by_category[category] = result
+    if not trends_by_category:
+        return {"status": "error", "message": f"Failed to get trends: {next(iter(errors.values()))}", "errors": errors}
+    
+    response = {
+        "status": "success",
+        "message": f"Successfully retrieved trends for {len(trends_by_category)} of {len(_TREND_CATEGORY_NAMES)} categories",
+        "trends_by_category": trends_by_category
+    }
+    if errors:
+        response["errors"] = errors
+    return response
+
+# ---- Batch Tools ----
+
+# Read-only tools that batch_read may dispatch to
+_BATCHABLE = {
+    "get_tweet_by_id": get_tweet_by_id,
+    "get_user_by_screen_name": get_user_by_screen_name,
+    "get_retweeters": get_retweeters,
+    "get_user_tweets": get_user_tweets,
+}
+
+# Limits for batch_read; operations are capped and run a few at a time to stay within rate limits
+MAX_BATCH_OPERATIONS = 20
+_BATCH_READ_CONCURRENCY = 5
+
+async def _run_batch_operation(x_service, operation, semaphore) -> dict:
+    """Run one batch_read operation, turning bad operations into error responses."""
+    if not isinstance(operation, dict):
+        return {"status": "error", "message": "Each operation must be an object with 'tool' and 'args'"}
+    
+    tool_name = operation.get("tool")
+    tool_func = _BATCHABLE.get(tool_name)
+    if tool_func is None:
+        return {"status": "error", "message": f"Tool {tool_name} cannot be batched. Must be one of: {', '.join(_BATCHABLE)}"}
+    
+    args = operation.get("args") or {}
+    if not isinstance(args, dict):
+        return {"status": "error", "message": "Operation args must be an object"}
+    
+    try:
+        # Check the arguments up front so TypeErrors raised by the tool itself aren't misreported
+        inspect.signature(tool_func).bind(x_service, **args)
+    except TypeError as e:
+        return {"status": "error", "message": f"Invalid arguments for {tool_name}: {str(e)}"}
+    
+    async with semaphore:
+        return await tool_func(x_service, **args)
+
+@mcp.tool()
+async def batch_read(x_service, operations: List[Dict[str, Any]]) -> dict:
+    """
+    Run several read-only lookups concurrently in a single call.
+    
+    Use this instead of calling the same lookup tools repeatedly; the requests
+    run in parallel (at most 5 at a time), and duplicate lookups within a batch
+    share one request.
+    
+    Args:
+        operations (list): The lookups to run (1-20 operations), each an object with:
+            - tool (str): One of 'get_tweet_by_id', 'get_user_by_screen_name',
+              'get_retweeters', 'get_user_tweets'
+            - args (dict): The arguments for that tool
+    
+    Returns:
+        dict: A dictionary containing:
+            - status (str): "success" or "error"
+            - message (str): Description of the result
+            - results (list, optional): One result per operation, in order, each in
+              the same format the individual tool returns
+    
+    Example:
+        Look up two tweets and a user:
+        [{"tool": "get_tweet_by_id", "args": {"tweet_id": "1234567890"}},
+         {"tool": "get_tweet_by_id", "args": {"tweet_id": "1234567891"}},
+         {"tool": "get_user_by_screen_name", "args": {"screen_name": "NASA"}}]
+    """
+    # Validate input
+    if not operations or not isinstance(operations, list):
+        return {"status": "error", "message": "Operations must be a non-empty list"}
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return {"status": "error", "message": f"At most {MAX_BATCH_OPERATIONS} operations can be run at once"}
     
     # Check service status
     is_ready, error_response = check_x_service(x_service)
     if not is_ready:
         return error_response
     
-    # Get trends
-    try:
-        log_debug("get_trends", f"Getting trends for category: {category}")
-        trends = await x_service._client.get_trends(category)
-        
-        # Format the trends
-        formatted_trends = []
-        for trend in trends:
-            formatted_trends.append({
-                "name": trend.name,
-                "tweets_count": trend.tweets_count if hasattr(trend, 'tweets_count') else None,
-                "domain_context": trend.domain_context if hasattr(trend, 'domain_context') else None
-            })
-        
-        return {
-            "status": "success",
-            "message": f"Successfully retrieved {len(formatted_trends)} {category} trends",
-            "trends": formatted_trends
-        }
-    except Exception as e:
-        error_msg = f"Failed to get trends: {str(e)}"
-        log_error("get_trends", error_msg, e)
-        return {"status": "error", "message": error_msg}
+    log_debug("batch_read", "Running %s operations", len(operations))
+    semaphore = asyncio.Semaphore(_BATCH_READ_CONCURRENCY)
+    results = await asyncio.gather(
+        *[_run_batch_operation(x_service, operation, semaphore) for operation in operations],
+        return_exceptions=True
+    )
+    
+    # Report anything that escaped a tool's own error handling per operation
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            log_error("batch_read", f"Operation {index} failed: {str(result)}", result)
+            results[index] = exception_response(f"Operation failed: {str(result)}", result)
+    
+    return {
+        "status": "success",
+        "message": f"Successfully ran {len(results)} operations",
+        "results": results
+    }
@@ -1,12 +1,33 @@
-import functools
-import traceback
-from typing import Callable, Dict, Any
+import logging
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Mapping, Tuple
 from urllib.parse import urlparse
+import httpx
 from x_client_transaction import ClientTransaction as XClientTransaction
 from twikit.x_client_transaction import ClientTransaction as TwikitClientTransaction
+from twikit.client.gql import Endpoint
 
-# Global variable for headers injection
-HEADERS_TO_INJECT = {}
+log = logging.getLogger(__name__)
+
+# Headers injected into every request, with the keys among them that are
+# content-type. The value is immutable and replaced as a whole, so requests read
+# it without copying; tasks inherit the value current when they were started,
+# and a task can set its own (e.g. another session's) without affecting others.
+_HEADERS_CTX: ContextVar[Tuple[Mapping[str, str], Tuple[str, ...]]] = ContextVar(
+    'x_headers', default=(MappingProxyType({}), ())
+)
+
+# The create tweet endpoint's path, whose transaction ID is the default header
+_GQL_CREATE_TWEET_PATH = urlparse(Endpoint.CREATE_TWEET).path
+
+# Paths of the API endpoints a transaction ID is generated for
+_TXID_PATH_PREFIXES = ('/i/api/graphql/', '/i/api/1.1/dm/')
+
+# Canonical (uppercase) spelling of the HTTP methods twikit uses, so the usual
+# methods don't allocate a new string per request
+_HTTP_METHODS = {name: name for name in ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')}
+_HTTP_METHODS.update({name.lower(): name for name in tuple(_HTTP_METHODS)})
 
 class ClientPatcher:
     """
@@ -42,41 +63,33 @@ class ClientPatcher:
         # Patch the HTTP client
         if hasattr(client, 'http') and hasattr(client.http, 'request'):
             self.original_http_request_method = client.http.request
-            client.http.request = functools.partial(
-                self.patched_http_client_request, 
-                self.original_http_request_method
-            )
-            print("Patched client.http.request method")
+            # A plain bound method: no partial layer between httpx's caller and the patch
+            client.http.request = self.patched_http_client_request
+            log.debug("Patched client.http.request method")
         else:
-            print("Error: client.http.request not available for patching")
+            log.error("client.http.request not available for patching")
             raise AttributeError("client.http.request not available for patching")
         
         # Disable UI metrics
         client.enable_ui_metrics = False
-        print(f"Set client.enable_ui_metrics to {client.enable_ui_metrics}")
+        log.debug("Set client.enable_ui_metrics to %s", client.enable_ui_metrics)
         
         return client
     
     def setup_headers(self, cookie_header: str, ct0_token: str):
         """
-        Set up the global headers for injection
+        Set up the headers for injection
         
         Args:
             cookie_header: The Cookie header value
             ct0_token: The ct0 token (CSRF token)
         """
-        global HEADERS_TO_INJECT
-        
-        # Generate initial transaction ID for the create tweet endpoint
-        gql_create_tweet_path = "/i/api/graphql/SiM_cAu83R0wnrpmKQQSEw/CreateTweet"
-        transaction_id = self.client_transaction.generate_transaction_id(
-            method="POST", 
-            path=gql_create_tweet_path
-        )
-        print(f"Generated initial transaction ID: {transaction_id}")
+        # The create tweet endpoint's ID doubles as the default for other requests
+        transaction_id = self.get_transaction_id("POST", _GQL_CREATE_TWEET_PATH)
+        log.debug("Generated initial transaction ID: %s", transaction_id)
         
         # Set up initial headers
-        HEADERS_TO_INJECT.update({
+        self._set_headers({
             "Cookie": cookie_header,
             "x-csrf-token": ct0_token,
             "x-client-transaction-id": transaction_id,
@@ -84,13 +97,39 @@ class ClientPatcher:
     
     def update_headers(self, headers: Dict[str, str]):
         """
-        Update the global headers with additional values
+        Update the injected headers with additional values
         
         Args:
             headers: Dictionary of headers to add/update
         """
-        global HEADERS_TO_INJECT
-        HEADERS_TO_INJECT.update(headers)
+        self._set_headers(headers)
+    
+    @staticmethod
+    def _set_headers(headers: Mapping[str, str]):
+        """Replace the injected headers with the current ones updated by `headers`"""
+        current, _ = _HEADERS_CTX.get()
+        merged = {**current, **headers}
+        content_type_keys = tuple(key for key in merged if key.lower() == 'content-type')
+        _HEADERS_CTX.set((MappingProxyType(merged), content_type_keys))
+    
+    def get_transaction_id(self, method: str, path: str) -> str:
+        """
+        Generate a fresh transaction ID for method and path
+        
+        Every ID embeds the current time and a random byte, so one is generated
+        per request rather than reused.
+        
+        Args:
+            method: The HTTP method (any case)
+            path: The URL path the ID is generated for
+        """
+        method = _HTTP_METHODS.get(method) or method.upper()
+        return self.client_transaction.generate_transaction_id(method=method, path=path)
+    
+    @staticmethod
+    def _get_base_headers() -> Tuple[Mapping[str, str], Tuple[str, ...]]:
+        """Get the injected headers and which of their keys are content-type"""
+        return _HEADERS_CTX.get()
     
     @staticmethod
     async def no_op_twikit_ct_init(self_ct, http_client, headers_arg):
@@ -108,55 +147,57 @@ class ClientPatcher:
         """No-op replacement for twikit's ClientTransaction.generate_transaction_id"""
         return "dummy_transaction_id_from_twikit_patch"
     
-    async def patched_http_client_request(self, original_http_request_method, method, url, **kwargs):
+    async def patched_http_client_request(self, method, url, **kwargs):
         """
         Patch for the HTTP client to inject headers and handle transaction IDs
         
         This matches the implementation from post_tweet_with_playwright_session.py
         """
-        global HEADERS_TO_INJECT
         try:
             # Log the request for debugging
-            print(f"--- Patched http.request called for: {method} {url} ---")
+            log.debug("Patched http.request called for: %s %s", method, url)
             
             # Get headers from the caller
-            headers_from_caller = kwargs.pop('headers', {})
+            headers_from_caller = kwargs.pop('headers', None)
             
-            # Start with the global headers to inject
-            final_headers = HEADERS_TO_INJECT.copy()
+            base_headers, base_content_type_keys = self._get_base_headers()
+            if not headers_from_caller:
+                # Nothing to merge: just copy the injected headers
+                final_headers = dict(base_headers)
+            else:
+                # Merge in one C-level step: the injected headers win over the
+                # caller's, except that the caller's content-type is preserved
+                final_headers = {**headers_from_caller, **base_headers}
+                for key in base_content_type_keys:
+                    if key in headers_from_caller:
+                        final_headers[key] = headers_from_caller[key]
             
-            # Merge with caller's headers, preserving content-type
-            for key, value in headers_from_caller.items():
-                if key.lower() == 'content-type':
-                    final_headers[key] = value
-                elif key not in final_headers:
-                    final_headers[key] = value
-            
-            # Log the headers for debugging
-            print(f"Original headers passed to http.request: {headers_from_caller}")
-            print(f"Headers to Inject (from global): {HEADERS_TO_INJECT}")
-            
-            # For GraphQL endpoints, ensure we have a fresh transaction ID
-            if '/i/api/graphql/' in url:
-                path = urlparse(url).path
-                transaction_id = self.client_transaction.generate_transaction_id(
-                    method=method.upper(), 
-                    path=path
-                )
+            # For GraphQL and DM endpoints, ensure we have a fresh transaction ID.
+            # twikit passes absolute URLs, so the path starts at the first '/'
+            # after the scheme and is matched in place against the prefixes.
+            path_start = url.find('/', url.find('://') + 3)
+            if path_start >= 0 and url.startswith(_TXID_PATH_PREFIXES, path_start):
+                query_start = url.find('?', path_start)
+                path = url[path_start:query_start] if query_start >= 0 else url[path_start:]
+                transaction_id = self.get_transaction_id(method, path)
                 final_headers['x-client-transaction-id'] = transaction_id
-                print(f"Generated new transaction ID for {method} {path}: {transaction_id}")
+                log.debug("Generated new transaction ID for %s %s: %s", method, path, transaction_id)
             
             # Update the global headers with the final set
             kwargs['headers'] = final_headers
-            print(f"Final headers for HTTP call: {final_headers}")
+            # Only the names are logged; the values include the session cookie and CSRF token
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Final header names for HTTP call: %s", sorted(final_headers))
             
             # Make the actual request
-            return await original_http_request_method(method, url, **kwargs)
+            return await self.original_http_request_method(method, url, **kwargs)
             
-        except Exception as e:
-            error_msg = f"Error in patched_http_client_request: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+        except httpx.HTTPError as e:
+            # Timeouts and connection failures are expected now and then; no stack needed
+            log.warning("HTTP request failed: %s %s: %s", method, url, e)
+            raise
+        except Exception:
+            log.exception("Error in patched_http_client_request for %s %s", method, url)
             raise
     
     def cleanup(self):
@@ -166,6 +207,6 @@ class ClientPatcher:
                 TwikitClientTransaction.init = self.original_twikit_ct_init
             if self.original_twikit_ct_generate_id is not None:
                 TwikitClientTransaction.generate_transaction_id = self.original_twikit_ct_generate_id
-            print("Cleaned up client patcher resources")
+            log.debug("Cleaned up client patcher resources")
         except Exception as e:
-            print(f"Error during cleanup: {e}")
+            log.error("Error during cleanup: %s", e)
@@ -0,0 +1,44 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# Calls currently in flight, keyed by (name, arguments)
+_pending: Dict[Hashable, asyncio.Future] = {}
+
+async def coalesce(key: Hashable, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Share one in-flight call between concurrent callers with the same key
+    
+    The first caller starts `coro_factory()` as a task; callers arriving while it
+    is still running await the same result (or exception) instead of starting
+    their own. Cancelling any caller, including the first, leaves the call
+    running for the rest.
+    
+    Args:
+        key: Identifies the call, e.g. (function name, arguments)
+        coro_factory: Returns the coroutine to run if nothing is pending
+    """
+    task = _pending.get(key)
+    if task is None:
+        # Run the shared call as its own task so no single caller owns it
+        task = asyncio.ensure_future(coro_factory())
+        _pending[key] = task
+        task.add_done_callback(functools.partial(_finish, key))
+    # Shield so a cancelled caller doesn't cancel the shared call for the others
+    return await asyncio.shield(task)
+
+def _finish(key: Hashable, task: asyncio.Future) -> None:
+    """Drop a finished call from the pending table."""
+    if _pending.get(key) is task:
+        del _pending[key]
+    # Mark the exception retrieved in case every caller was cancelled
+    if not task.cancelled():
+        task.exception()
+
+def single_flight(func):
+    """Coalesce concurrent calls to an async function with the same arguments."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (func.__name__, args + tuple(sorted(kwargs.items())))
+        return await coalesce(key, lambda: func(*args, **kwargs))
+    return wrapper
@@ -0,0 +1,91 @@
+import functools
+import time
+from typing import Any, Callable, Dict, Tuple
+
+# Defaults for tool result caches
+DEFAULT_TTL = 60.0
+DEFAULT_MAXSIZE = 1024
+
+class CacheDict(dict):
+    """
+    Maps (function name, args, sorted kwargs) to (monotonic expiry, result)
+
+    `generation` is bumped on every invalidation, so a call that started before
+    it doesn't store its possibly stale result afterwards.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.generation = 0
+
+def _cache_key(name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Build a cache key, holding the client (first argument) by id so a replaced client can be freed"""
+    if args:
+        args = (id(args[0]),) + args[1:]
+    return (name, args, tuple(sorted(kwargs.items())))
+
+def async_ttl_cache(cache: CacheDict, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE):
+    """
+    Cache the results of an async function in `cache` for `ttl` seconds
+
+    Only results are cached; if the function raises, nothing is stored and the
+    next call tries again. The function's first argument is taken to be the
+    client and is keyed by identity.
+
+    Args:
+        cache: The dict to keep entries in, so callers can share or invalidate it
+        ttl: Seconds an entry stays valid
+        maxsize: Maximum number of entries before old ones are evicted
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = _cache_key(func.__name__, args, kwargs)
+            now = time.monotonic()
+            entry = cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            
+            generation = cache.generation
+            result = await func(*args, **kwargs)
+            if cache.generation != generation:
+                # Invalidated while the call was in flight; the result may be stale
+                return result
+            
+            if len(cache) >= maxsize:
+                # Drop expired entries first, then the oldest if still full
+                for stale_key in [k for k, (expiry, _) in cache.items() if expiry <= now]:
+                    del cache[stale_key]
+                if len(cache) >= maxsize:
+                    del cache[next(iter(cache))]
+            cache[key] = (now + ttl, result)
+            return result
+        return wrapper
+    return decorator
+
+def invalidate_cache(cache: CacheDict, value: Any = None) -> None:
+    """
+    Drop cached entries
+
+    Args:
+        cache: The cache to invalidate
+        value: If given, only entries whose arguments include this value are
+            dropped (e.g. a user ID); otherwise the whole cache is cleared
+    """
+    cache.generation += 1
+    if value is None:
+        cache.clear()
+        return
+    for key in [key for key in cache if value in key[1] or value in (v for _, v in key[2])]:
+        del cache[key]
+
+def invalidate_results(cache: CacheDict, predicate: Callable[[Any], bool]) -> None:
+    """
+    Drop cached entries by their result, for caches not keyed by the changed value
+
+    Args:
+        cache: The cache to invalidate
+        predicate: Called with each cached result; entries it returns True for are dropped
+    """
+    cache.generation += 1
+    for key in [key for key, (_, result) in cache.items() if predicate(result)]:
+        del cache[key]
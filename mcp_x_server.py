@@ -7,7 +7,6 @@ A FastMCP server for interacting with X (formerly Twitter)
 
 import os
 import sys
-import asyncio
 from pathlib import Path
 
 # Add the mcp-x-server directory to the path
@@ -16,7 +15,7 @@ if str(server_dir) not in sys.path:
     sys.path.append(str(server_dir))
 
 # Import the main entry point from the server
-from main import main
+from main import run_server
 
 if __name__ == "__main__":
     # Set up any environment variables or configuration
@@ -28,4 +27,4 @@ if __name__ == "__main__":
         print(f"X_DATA_DIR not set, using default: {default_data_dir}")
     
     # Run the server
-    asyncio.run(main())
+    run_server()
@@ -91,8 +91,8 @@ class TwitterAuthenticator:
                         home_html, ondemand_js = self.get_transaction_generator_data()
                         if home_html and ondemand_js:
                             home_soup = bs4.BeautifulSoup(home_html, 'html.parser')
-                            ondemand_soup = bs4.BeautifulSoup(ondemand_js, 'html.parser')
-                            ct = ClientTransaction(home_page_response=home_soup, ondemand_file_response=ondemand_soup)
+                            # The ondemand file is JavaScript, read by ClientTransaction as plain text
+                            ct = ClientTransaction(home_page_response=home_soup, ondemand_file_response=ondemand_js)
                             test_path = urlparse(test_url).path
                             transaction_id = ct.generate_transaction_id(method="GET", path=test_path)
                             sys.stderr.write(f"Generated transaction ID: {transaction_id}\n")
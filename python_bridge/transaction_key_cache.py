@@ -0,0 +1,79 @@
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable, Optional
+import orjson
+from x_client_transaction import ClientTransaction
+
+log = logging.getLogger(__name__)
+
+# Where the key material derived from the home page and ondemand file is cached
+# between starts, shared by twikit_mcp_server.py and twikit_service.py
+TRANSACTION_KEY_CACHE_FILE = 'tx_key_cache.json'
+
+# The instance attributes ClientTransaction.__init__ sets, and the ones cached.
+# A generator is only cached when it has exactly these attributes, so a library
+# release that adds or renames one falls back to a full parse instead of
+# producing a half-initialized generator.
+_GENERATOR_ATTRS = frozenset((
+    'home_page_response', 'ondemand_file_response', 'random_keyword', 'random_number',
+    'row_index', 'key_bytes_indices', 'key', 'key_bytes', 'animation_key',
+))
+_CACHED_ATTRS = ('random_keyword', 'random_number', 'row_index', 'key_bytes_indices', 'key', 'animation_key')
+
+def _digest(home_html: str, ondemand_js: str) -> str:
+    """Hash both inputs, so the cache is only reused for the same Playwright export"""
+    return hashlib.blake2b(home_html.encode('utf-8') + b'\0' + ondemand_js.encode('utf-8')).hexdigest()
+
+def _rebuild(cached: dict) -> Optional[ClientTransaction]:
+    """Rebuild a generator from cached key material, or None if any of it is missing"""
+    if any(name not in cached for name in _CACHED_ATTRS) or not hasattr(ClientTransaction, 'get_key_bytes'):
+        return None
+    # Skip __init__, which would parse the HTML to derive these again
+    generator = ClientTransaction.__new__(ClientTransaction)
+    generator.home_page_response = None
+    generator.ondemand_file_response = None
+    for name in _CACHED_ATTRS:
+        setattr(generator, name, cached[name])
+    generator.key_bytes = generator.get_key_bytes(key=generator.key)
+    return generator
+
+def load_transaction_generator(data_dir, home_html: str, ondemand_js: str,
+                               build: Callable[[], ClientTransaction]) -> ClientTransaction:
+    """
+    Get the transaction ID generator, reusing key material cached from a previous start
+
+    Generating IDs only needs the key and animation key derived from the home
+    page and ondemand file, so the HTML is only parsed again when the export
+    changes or the cache can't be used.
+
+    Args:
+        data_dir: Directory the cache file is kept in
+        home_html: The exported home page
+        ondemand_js: The exported ondemand file
+        build: Builds the generator with a full parse when there is no usable cache
+    """
+    digest = _digest(home_html, ondemand_js)
+    cache_path = Path(data_dir) / TRANSACTION_KEY_CACHE_FILE
+    try:
+        cached = orjson.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        cached = None # No usable cache; parse below
+    if isinstance(cached, dict) and cached.get('digest') == digest:
+        generator = _rebuild(cached)
+        if generator is not None:
+            log.info("Loaded transaction ID key material from cache")
+            return generator
+
+    generator = build()
+    if set(vars(generator)) != _GENERATOR_ATTRS:
+        log.warning("ClientTransaction attributes changed; not caching its key material")
+        return generator
+    try:
+        cache_path.write_bytes(orjson.dumps({
+            "digest": digest,
+            **{name: getattr(generator, name) for name in _CACHED_ATTRS},
+        }))
+    except OSError as e:
+        log.warning("Could not cache transaction ID key material: %s", e)
+    return generator
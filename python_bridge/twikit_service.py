@@ -1,23 +1,46 @@
 import asyncio
-import json
+import orjson
 import sys
 import os
+import time
 from pathlib import Path
 from urllib.parse import urlparse
-import importlib.util
 import bs4
 import functools
+import httpx
 from twikit import Client
 from twikit.x_client_transaction import ClientTransaction as TwikitClientTransactionInternal
 from twikit.client.gql import Endpoint
 from x_client_transaction import ClientTransaction as YourCustomClientTransaction
-import traceback
+from transaction_key_cache import load_transaction_generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
 
-# Import TwitterAuthenticator from playwright_login_and_export.py
-from playwright_login_and_export import TwitterAuthenticator
+# Headers injected into every HTTP request, as a read-only view replaced as a
+# whole by set_injected_headers(), with the keys among them that are content-type
+HEADERS_TO_INJECT = MappingProxyType({})
+_INJECTED_CONTENT_TYPE_KEYS = ()
 
-# Global store for headers to inject into every HTTP request
-HEADERS_TO_INJECT = {}
+# Transaction ID for the request being made, set only around the call it was
+# generated for. Commands run concurrently, so this is per task rather than
+# part of HEADERS_TO_INJECT.
+_TRANSACTION_ID = ContextVar('transaction_id', default=None)
+
+# Commands handled at once, and how many may wait before reading stdin pauses
+COMMAND_WORKERS = 8
+COMMAND_QUEUE_SIZE = 64
+
+try:
+    import h2  # noqa: F401 -- only needed so httpx can negotiate HTTP/2
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# One keep-alive pool shared by all workers, so concurrent commands reuse
+# connections instead of paying a fresh TCP+TLS handshake
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
 
 # Save the original print function before redefining it
 _original_print = print
@@ -31,40 +54,109 @@ def print_stderr(*args, **kwargs):
 # Redirect standard print to stderr
 print = print_stderr
 
+# Binary stdout for JSON responses, flushed at most once per event loop pass
+STDOUT = sys.stdout.buffer
+_flush_scheduled = False
+
+def _flush_stdout():
+    global _flush_scheduled
+    _flush_scheduled = False
+    STDOUT.flush()
+
 # When sending JSON responses, use a dedicated function
 def send_json_response(response_obj):
     """Send a JSON response to stdout for the Node.js process to read"""
-    json_str = json.dumps(response_obj)
-    sys.stdout.write(json_str + '\n')
-    sys.stdout.flush()
-
-async def patched_http_client_request(original_http_request_method, method, url, **kwargs):
-    global HEADERS_TO_INJECT
-    # Merge caller headers with our injected headers
-    headers_from_caller = kwargs.pop('headers', {})
-    final_headers = HEADERS_TO_INJECT.copy()
-    for key, value in headers_from_caller.items():
-        if key.lower() == 'content-type':
-            final_headers[key] = value
-        elif key not in final_headers:
-            final_headers[key] = value
-    kwargs['headers'] = final_headers
-    return await original_http_request_method(method, url, **kwargs)
+    global _flush_scheduled
+    # orjson produces bytes, so write them to the buffer without re-encoding
+    STDOUT.write(orjson.dumps(response_obj, option=orjson.OPT_APPEND_NEWLINE))
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        STDOUT.flush()
+        return
+    # Responses finished in the same pass go out together in one flush
+    if not _flush_scheduled:
+        _flush_scheduled = True
+        loop.call_soon(_flush_stdout)
+
+# Longest command line accepted from stdin (StreamReader's default is only 64 KiB)
+STDIN_LINE_LIMIT = 16 * 1024 * 1024
+
+async def open_stdin_reader():
+    """
+    Return a coroutine function that reads the next stdin line as bytes (b'' at EOF)
+
+    Stdin is read by the event loop directly when it is a pipe; otherwise (e.g.
+    a regular file, or a loop without pipe support) lines are read in a thread.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except (NotImplementedError, ValueError, OSError):
+        return functools.partial(loop.run_in_executor, None, sys.stdin.buffer.readline)
+    return reader.readline
+
+def build_transaction_generator(data_dir, home_html, ondemand_js):
+    """Build the transaction ID generator, parsing the home page only when its cached keys can't be used"""
+    # The ondemand file is only read as text, so just the home page is parsed
+    return load_transaction_generator(data_dir, home_html, ondemand_js, lambda: YourCustomClientTransaction(
+        home_page_response=bs4.BeautifulSoup(home_html, 'lxml'), ondemand_file_response=ondemand_js))
+
+def set_injected_headers(headers):
+    """Replace the headers injected into every HTTP request"""
+    global HEADERS_TO_INJECT, _INJECTED_CONTENT_TYPE_KEYS
+    HEADERS_TO_INJECT = MappingProxyType(dict(headers))
+    _INJECTED_CONTENT_TYPE_KEYS = tuple(key for key in headers if key.lower() == 'content-type')
+
+def make_patched_http_request(original_http_request_method):
+    """Build the replacement for client.http.request, calling the original directly"""
+    async def patched_http_client_request(method, url, **kwargs):
+        # Merge caller headers with our injected headers. The injected ones win,
+        # except that the caller's content-type is kept.
+        headers_from_caller = kwargs.pop('headers', None)
+        transaction_id = _TRANSACTION_ID.get()
+        if not headers_from_caller:
+            if transaction_id is None:
+                # Nothing to add: httpx takes the read-only view as is, no copy needed
+                final_headers = HEADERS_TO_INJECT
+            else:
+                final_headers = {**HEADERS_TO_INJECT, 'x-client-transaction-id': transaction_id}
+        else:
+            final_headers = {**headers_from_caller, **HEADERS_TO_INJECT}
+            for key in _INJECTED_CONTENT_TYPE_KEYS:
+                if key in headers_from_caller:
+                    final_headers[key] = headers_from_caller[key]
+            if transaction_id is not None:
+                final_headers['x-client-transaction-id'] = transaction_id
+        kwargs['headers'] = final_headers
+        return await original_http_request_method(method, url, **kwargs)
+    return patched_http_client_request
 
 async def no_op_twikit_ct_init(self_ct, http_client, headers_arg):
-    # Skip Twikit's internal ClientTransaction initialization
-    if not hasattr(self_ct, 'home_page_response'):
-        self_ct.home_page_response = True
-    if not hasattr(self_ct, 'DEFAULT_KEY_BYTES_INDICES'):
-        self_ct.DEFAULT_KEY_BYTES_INDICES = []
-    if not hasattr(self_ct, 'DEFAULT_ROW_INDEX'):
-        self_ct.DEFAULT_ROW_INDEX = 0
-    return
+    # Skip Twikit's internal ClientTransaction initialization. Marking the home
+    # page as loaded makes Twikit stop calling init (and backing up and
+    # restoring its cookies around the call) before every request.
+    self_ct.home_page_response = True
 
 def no_op_twikit_ct_generate_id(self_ct, method, path, response=None, key=None, animation_key=None, time_now=None):
     # We will generate our own transaction IDs via transaction_generator
     return "dummy"
 
+_twikit_patched = False
+
+def apply_twikit_patches():
+    """Replace Twikit's internal ClientTransaction setup and ID generation with no-ops (once per process)"""
+    global _twikit_patched
+    if _twikit_patched:
+        return
+    TwikitClientTransactionInternal.init = no_op_twikit_ct_init
+    TwikitClientTransactionInternal.generate_transaction_id = no_op_twikit_ct_generate_id
+    # Class-level defaults for the attributes the real init would have filled in
+    TwikitClientTransactionInternal.DEFAULT_KEY_BYTES_INDICES = ()
+    TwikitClientTransactionInternal.DEFAULT_ROW_INDEX = 0
+    _twikit_patched = True
+
 async def main():
     env_data_dir_path = os.getenv('TWIKIT_DATA_DIR')
 
@@ -96,6 +188,8 @@ async def main():
 
     # Try to use Playwright-captured authentication data
     try:
+        # Imported here so importing this module doesn't load Playwright
+        from playwright_login_and_export import TwitterAuthenticator
         auth = TwitterAuthenticator(data_dir=str(data_dir)) # Pass string representation of Path
         common_headers = auth.get_common_headers()
         cookies_dict = auth.get_cookies_dict()
@@ -105,207 +199,377 @@ async def main():
             print_stderr("Please run playwright_login_and_export.py first and ensure you are logged in.\n")
             send_json_response({"id": None, "success": False, "error": "Missing authentication or transaction generator data"})
             return
-        # Set up transaction generator
-        home_soup = bs4.BeautifulSoup(home_html, 'html.parser')
-        ondemand_soup = bs4.BeautifulSoup(ondemand_js, 'html.parser')
-        transaction_generator = YourCustomClientTransaction(home_page_response=home_soup, ondemand_file_response=ondemand_soup)
+        # Build the transaction generator in a thread (parsing the home page can
+        # take a while); the client is set up below in the meantime
+        generator_task = asyncio.ensure_future(
+            asyncio.to_thread(build_transaction_generator, data_dir, home_html, ondemand_js))
         print_stderr("Loaded authentication and transaction generator data from Playwright export.\n")
     except Exception as e:
         print_stderr(f"Error loading Playwright authentication data: {str(e)}\n")
         send_json_response({"id": None, "success": False, "error": str(e)})
         return
 
-    # --- Set up Twikit client with patched HTTP to inject headers and custom transaction IDs ---
-    # Patch internal Twikit ClientTransaction methods to no-op
-    original_twikit_ct_init = TwikitClientTransactionInternal.init
-    TwikitClientTransactionInternal.init = no_op_twikit_ct_init
-    original_twikit_ct_generate_id = TwikitClientTransactionInternal.generate_transaction_id
-    TwikitClientTransactionInternal.generate_transaction_id = no_op_twikit_ct_generate_id
+    try:
+        # --- Set up Twikit client with patched HTTP to inject headers and custom transaction IDs ---
+        # Patch internal Twikit ClientTransaction methods to no-op
+        apply_twikit_patches()
 
-    # Initialize Twikit client and patch its HTTP request method
-    client = Client('en-US')
-    if hasattr(client, 'http') and hasattr(client.http, 'request'):
-        original_http = client.http.request
-        client.http.request = functools.partial(patched_http_client_request, original_http)
-    else:
-        print_stderr("Error: client.http.request not available for patching. Aborting.\n")
-        return
-    client.enable_ui_metrics = False
+        # Initialize Twikit client and patch its HTTP request method
+        client = Client('en-US', http2=HTTP2, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        # Our generator supplies the IDs, so Twikit's transaction never needs its init
+        client.client_transaction.home_page_response = True
+        if hasattr(client, 'http') and hasattr(client.http, 'request'):
+            original_http = client.http.request
+            # A closure over the original, so there is no partial layer per request
+            client.http.request = make_patched_http_request(original_http)
+        else:
+            print_stderr("Error: client.http.request not available for patching. Aborting.\n")
+            return
+        client.enable_ui_metrics = False
+
+        # Populate static injected headers: cookies, CSRF token, and other common headers
+        cookie_header = "; ".join([f"{name}={value}" for name, value in cookies_dict.items()])
+        ct0_token = cookies_dict.get('ct0')
+        injected_headers = dict(common_headers)
+        if ct0_token:
+            injected_headers['x-csrf-token'] = ct0_token
+        injected_headers['Cookie'] = cookie_header
+        set_injected_headers(injected_headers)
 
-    # Populate static injected headers: cookies, CSRF token, and other common headers
-    cookie_header = "; ".join([f"{name}={value}" for name, value in cookies_dict.items()])
-    ct0_token = cookies_dict.get('ct0')
-    HEADERS_TO_INJECT.update(common_headers)
-    if ct0_token:
-        HEADERS_TO_INJECT['x-csrf-token'] = ct0_token
-    HEADERS_TO_INJECT['Cookie'] = cookie_header
+        load_user_id_cache(data_dir)
+
+        try:
+            transaction_generator = await generator_task
+        except Exception as e:
+            print_stderr(f"Error building transaction generator: {str(e)}\n")
+            send_json_response({"id": None, "success": False, "error": str(e)})
+            return
+    finally:
+        # Setup can exit early; don't leave the generator build unawaited or its
+        # exception unretrieved
+        if not generator_task.done():
+            generator_task.cancel()
+        elif not generator_task.cancelled():
+            generator_task.exception()
 
     # Notify Node.js that Python service is ready
     ready_signal = {"status": "ready"}
     send_json_response(ready_signal)
 
-    # Process commands from stdin
-    loop = asyncio.get_event_loop()
+    # Read commands from stdin and hand them to a pool of workers, so a slow
+    # command doesn't hold up the independent ones queued behind it
+    queue = asyncio.Queue(maxsize=COMMAND_QUEUE_SIZE)
+    workers = [
+        asyncio.create_task(command_worker(queue, client, transaction_generator))
+        for _ in range(COMMAND_WORKERS)
+    ]
+    readline = await open_stdin_reader()
     while True:
-        line = await loop.run_in_executor(None, sys.stdin.readline)
+        line = await readline()
         if not line:
             break # EOF
-        request_id = None
+        line = line.strip()
+        if not line:
+            continue # Blank keepalive line
+        # Commands are JSON objects; reject anything else without running the parser
+        if line[:1] != b'{':
+            send_json_response({"id": None, "success": False, "error": "Command must be a JSON object"})
+            continue
         try:
-            command_data = json.loads(line)
-            request_id = command_data.get('id')
-            action = command_data.get('action')
-            args = command_data.get('args', {})
-            if not action:
-                raise ValueError("Missing 'action' in command")
-            if action == 'get_transaction_id':
-                # Expects 'url' and 'method' in args
-                if 'url' not in args or 'method' not in args:
-                    raise ValueError("Missing 'url' or 'method' for get_transaction_id action")
-                method = args['method']
-                url = args['url']
-                try:
-                    path = urlparse(url).path
-                    transaction_id = transaction_generator.generate_transaction_id(method=method, path=path)
-                    response_data = {"id": request_id, "success": True, "data": transaction_id}
-                except Exception as e:
-                    response_data = {"id": request_id, "success": False, "error": f"Failed to generate transaction ID: {str(e)}"}
-            elif action == 'postTweet':
-                text = args.get('text')
-                if text is None:
-                    raise ValueError("Missing 'text' for postTweet")
-                # Generate transaction ID for CreateTweet GraphQL
-                path = urlparse(Endpoint.CREATE_TWEET).path
-                HEADERS_TO_INJECT['x-client-transaction-id'] = transaction_generator.generate_transaction_id(method="POST", path=path)
-                tweet = await client.create_tweet(text=text)
-                response_data = {"id": request_id, "success": True, "data": {"tweetId": tweet.id}}
-            elif action == 'postTweetWithMedia':
-                text = args.get('text')
-                media_path = args.get('mediaPath')
-                media_type = args.get('mediaType')
-                alt_text = args.get('altText')
-                if None in (text, media_path, media_type):
-                    raise ValueError("Missing arguments for postTweetWithMedia")
-                # Upload media (REST endpoint)
-                media_id = await client.upload_media(media_path)
-                if alt_text:
-                    await client.create_media_metadata(media_id, alt_text=alt_text)
-                # Create tweet with media
-                path = urlparse(Endpoint.CREATE_TWEET).path
-                HEADERS_TO_INJECT['x-client-transaction-id'] = transaction_generator.generate_transaction_id(method="POST", path=path)
-                tweet = await client.create_tweet(text=text, media_ids=[media_id])
-                response_data = {"id": request_id, "success": True, "data": {"tweetId": tweet.id}}
-            elif action == 'likeTweet':
-                tweet_id = args.get('tweetId')
-                if tweet_id is None:
-                    raise ValueError("Missing 'tweetId' for likeTweet")
-                path = urlparse(Endpoint.FAVORITE_TWEET).path
-                HEADERS_TO_INJECT['x-client-transaction-id'] = transaction_generator.generate_transaction_id(method="POST", path=path)
-                await client.favorite_tweet(tweet_id)
-                response_data = {"id": request_id, "success": True}
-            elif action == 'unlikeTweet':
-                tweet_id = args.get('tweetId')
-                if tweet_id is None:
-                    raise ValueError("Missing 'tweetId' for unlikeTweet")
-                path = urlparse(Endpoint.UNFAVORITE_TWEET).path
-                HEADERS_TO_INJECT['x-client-transaction-id'] = transaction_generator.generate_transaction_id(method="POST", path=path)
-                await client.unfavorite_tweet(tweet_id)
-                response_data = {"id": request_id, "success": True}
-            elif action == 'getLikedTweets':
-                user_id = args.get('userId')
-                max_results = args.get('maxResults', 20)
-                result = await client.get_user_tweets(user_id, 'Likes', max_results)
-                response_data = {"id": request_id, "success": True, "data": [t.id for t in result]}
-            elif action == 'searchTweets':
-                query = args.get('query')
-                max_results = args.get('maxResults', 20)
-                tweets = await client.search_tweet(query, 'Top', max_results)
-                response_data = {"id": request_id, "success": True, "data": [t.id for t in tweets]}
-            elif action == 'replyToTweet':
-                tweet_id = args.get('tweetId')
-                text = args.get('text')
-                if None in (tweet_id, text):
-                    raise ValueError("Missing arguments for replyToTweet")
-                path = urlparse(Endpoint.CREATE_TWEET).path
-                HEADERS_TO_INJECT['x-client-transaction-id'] = transaction_generator.generate_transaction_id(method="POST", path=path)
-                reply = await client.create_tweet(text=text, reply_to=tweet_id)
-                response_data = {"id": request_id, "success": True, "data": {"tweetId": reply.id}}
-            elif action == 'getUserTimeline':
-                user_id = args.get('userId')
-                max_results = args.get('maxResults', 20)
-                timeline = await client.get_user_tweets(user_id, 'Tweets', max_results)
-                response_data = {"id": request_id, "success": True, "data": [t.id for t in timeline]}
-            elif action == 'getTweetById':
-                tweet_id = args.get('tweetId')
-                tweet = await client.get_tweet_by_id(tweet_id)
-                response_data = {"id": request_id, "success": True, "data": {"tweetId": tweet.id, "text": tweet.text}}
-            elif action == 'getUserInfo':
-                username = args.get('username')
-                user = await client.get_user_by_screen_name(username)
-                response_data = {"id": request_id, "success": True, "data": {"userId": user.id, "username": user.screen_name}}
-            elif action == 'getTweetsByIds':
-                tweet_ids = args.get('tweetIds', [])
-                tweets = await client.get_tweets_by_ids(tweet_ids)
-                response_data = {"id": request_id, "success": True, "data": [t.id for t in tweets]}
-            elif action == 'retweet':
-                tweet_id = args.get('tweetId')
-                path = urlparse(Endpoint.RETWEET).path
-                HEADERS_TO_INJECT['x-client-transaction-id'] = transaction_generator.generate_transaction_id(method="POST", path=path)
-                await client.retweet(tweet_id)
-                response_data = {"id": request_id, "success": True}
-            elif action == 'undoRetweet':
-                tweet_id = args.get('tweetId')
-                path = urlparse(Endpoint.DELETE_RETWEET).path
-                HEADERS_TO_INJECT['x-client-transaction-id'] = transaction_generator.generate_transaction_id(method="POST", path=path)
-                await client.delete_retweet(tweet_id)
-                response_data = {"id": request_id, "success": True}
-            elif action == 'getRetweets':
-                tweet_id = args.get('tweetId')
-                max_results = args.get('maxResults', 20)
-                users = await client.get_retweeters(tweet_id, max_results)
-                response_data = {"id": request_id, "success": True, "data": [u.id for u in users]}
-            elif action == 'followUser':
-                username = args.get('username')
-                user = await client.get_user_by_screen_name(username)
-                out = await client.follow_user(user.id)
-                response_data = {"id": request_id, "success": True, "data": {"userId": out.id}}
-            elif action == 'unfollowUser':
-                username = args.get('username')
-                user = await client.get_user_by_screen_name(username)
-                out = await client.unfollow_user(user.id)
-                response_data = {"id": request_id, "success": True, "data": {"userId": out.id}}
-            elif action == 'deleteTweet':
-                tweet_id = args.get('tweetId')
-                await client.delete_tweet(tweet_id)
-                response_data = {"id": request_id, "success": True}
-            else:
-                response_data = {"id": request_id, "success": False, "error": f"Unknown action '{action}'"}
-        except json.JSONDecodeError as e:
-            response_data = {"id": request_id, "success": False, "error": f"Invalid JSON command: {str(e)}"}
-        except Exception as e:
-            response_data = {"id": request_id, "success": False, "error": str(e)}
-        send_json_response(response_data)
+            command_data = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            send_json_response({"id": None, "success": False, "error": f"Invalid JSON command: {str(e)}"})
+            continue
+        await queue.put(command_data)
+    
+    # Finish the commands already read before exiting
+    await queue.join()
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+# Screen name (lowercased) -> (user ID, screen name, saved at), kept across
+# starts in data_dir. Handles can be renamed and claimed by someone else, so
+# entries expire and only serve reads; follow/unfollow always look the user up.
+USER_ID_CACHE_FILE = 'user_id_cache.json'
+USER_ID_CACHE_TTL = 3600.0
+USER_ID_CACHE = {}
+_user_id_cache_path = None
+
+def load_user_id_cache(data_dir):
+    """Load the unexpired screen name -> user ID entries saved by a previous run, if any"""
+    global _user_id_cache_path
+    _user_id_cache_path = Path(data_dir) / USER_ID_CACHE_FILE
+    try:
+        cached = orjson.loads(_user_id_cache_path.read_bytes())
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        print_stderr(f"Ignoring unreadable user ID cache: {str(e)}\n")
+        return
+    if not isinstance(cached, dict):
+        return
+    cutoff = time.time() - USER_ID_CACHE_TTL
+    for key, entry in cached.items():
+        if isinstance(entry, list) and len(entry) == 3 and isinstance(entry[2], (int, float)) and entry[2] > cutoff:
+            USER_ID_CACHE[key] = tuple(entry)
+
+def save_user_id_cache():
+    """Write the unexpired screen name -> user ID entries to disk"""
+    if _user_id_cache_path is None:
+        return
+    cutoff = time.time() - USER_ID_CACHE_TTL
+    for key in [key for key, entry in USER_ID_CACHE.items() if entry[2] <= cutoff]:
+        del USER_ID_CACHE[key]
+    try:
+        _user_id_cache_path.write_bytes(orjson.dumps(USER_ID_CACHE))
+    except OSError as e:
+        print_stderr(f"Could not save user ID cache: {str(e)}\n")
+
+def remember_user(user):
+    """Record a looked-up user's ID under their screen name, saving the cache if it changed"""
+    key = user.screen_name.lower()
+    entry = USER_ID_CACHE.get(key)
+    USER_ID_CACHE[key] = (user.id, user.screen_name, time.time())
+    if entry is None or entry[0] != user.id:
+        save_user_id_cache()
+
+def cached_user(username):
+    """Get (user ID, screen name) for a screen name if cached and not expired"""
+    if not isinstance(username, str):
+        return None
+    entry = USER_ID_CACHE.get(username.lower())
+    if entry is None or time.time() - entry[2] >= USER_ID_CACHE_TTL:
+        return None
+    return entry[0], entry[1]
+
+# GraphQL paths of the endpoints that are sent a transaction ID, parsed once at import
+_PATH_CREATE_TWEET = urlparse(Endpoint.CREATE_TWEET).path
+_PATH_FAVORITE_TWEET = urlparse(Endpoint.FAVORITE_TWEET).path
+_PATH_UNFAVORITE_TWEET = urlparse(Endpoint.UNFAVORITE_TWEET).path
+_PATH_CREATE_RETWEET = urlparse(Endpoint.CREATE_RETWEET).path
+_PATH_DELETE_RETWEET = urlparse(Endpoint.DELETE_RETWEET).path
+
+# The endpoint path each action generates its transaction ID for
+PATHS = {
+    "postTweet": _PATH_CREATE_TWEET,
+    "postTweetWithMedia": _PATH_CREATE_TWEET,
+    "replyToTweet": _PATH_CREATE_TWEET,
+    "likeTweet": _PATH_FAVORITE_TWEET,
+    "unlikeTweet": _PATH_UNFAVORITE_TWEET,
+    "retweet": _PATH_CREATE_RETWEET,
+    "undoRetweet": _PATH_DELETE_RETWEET,
+}
+
+@contextmanager
+def transaction_id_for(transaction_generator, action):
+    """Send a fresh transaction ID for the action's POST with the requests made inside the block"""
+    token = _TRANSACTION_ID.set(transaction_generator.generate_transaction_id(method="POST", path=PATHS[action]))
+    try:
+        yield
+    finally:
+        _TRANSACTION_ID.reset(token)
 
-async def handle_command(client, command):
+@functools.lru_cache(maxsize=256)
+def _path_of(url):
+    """Path component of a URL; callers ask about the same few endpoints over and over"""
+    return urlparse(url).path
+
+# Action handlers: each takes (client, args, transaction_generator) and returns
+# the response data, or None for responses without data
+
+def handle_get_transaction_id(client, args, transaction_generator):
+    # Expects 'url' and 'method' in args. Purely CPU-bound, so this runs
+    # synchronously instead of as a coroutine (see SYNC_HANDLERS)
+    try:
+        url = args['url']
+        method = args['method']
+    except (KeyError, TypeError):
+        raise ValueError("Missing 'url' or 'method' for get_transaction_id action") from None
     try:
-        # ... existing code ...
-        
-        # When returning a response
-        response = {
-            "id": command_id,
-            "success": True,
-            "data": result
-        }
-        send_json_response(response)
-        
+        return transaction_generator.generate_transaction_id(method=method, path=_path_of(url))
     except Exception as e:
-        # ... error handling ...
-        error_response = {
-            "id": command_id,
-            "success": False,
-            "error": str(e)
-        }
-        send_json_response(error_response)
+        raise ValueError(f"Failed to generate transaction ID: {str(e)}") from e
+
+async def handle_post_tweet(client, args, transaction_generator):
+    text = args.get('text')
+    if text is None:
+        raise ValueError("Missing 'text' for postTweet")
+    with transaction_id_for(transaction_generator, 'postTweet'):
+        tweet = await client.create_tweet(text=text)
+    return {"tweetId": tweet.id}
+
+async def handle_post_tweet_with_media(client, args, transaction_generator):
+    text = args.get('text')
+    media_path = args.get('mediaPath')
+    media_type = args.get('mediaType')
+    alt_text = args.get('altText')
+    if None in (text, media_path, media_type):
+        raise ValueError("Missing arguments for postTweetWithMedia")
+    # Upload media (REST endpoint)
+    media_id = await client.upload_media(media_path)
+    if alt_text:
+        await client.create_media_metadata(media_id, alt_text=alt_text)
+    # Create tweet with media
+    with transaction_id_for(transaction_generator, 'postTweetWithMedia'):
+        tweet = await client.create_tweet(text=text, media_ids=[media_id])
+    return {"tweetId": tweet.id}
+
+async def handle_like_tweet(client, args, transaction_generator):
+    tweet_id = args.get('tweetId')
+    if tweet_id is None:
+        raise ValueError("Missing 'tweetId' for likeTweet")
+    with transaction_id_for(transaction_generator, 'likeTweet'):
+        await client.favorite_tweet(tweet_id)
+
+async def handle_unlike_tweet(client, args, transaction_generator):
+    tweet_id = args.get('tweetId')
+    if tweet_id is None:
+        raise ValueError("Missing 'tweetId' for unlikeTweet")
+    with transaction_id_for(transaction_generator, 'unlikeTweet'):
+        await client.unfavorite_tweet(tweet_id)
+
+async def handle_get_liked_tweets(client, args, transaction_generator):
+    result = await client.get_user_tweets(args.get('userId'), 'Likes', args.get('maxResults', 20))
+    return [t.id for t in result]
+
+async def handle_search_tweets(client, args, transaction_generator):
+    tweets = await client.search_tweet(args.get('query'), 'Top', args.get('maxResults', 20))
+    return [t.id for t in tweets]
+
+async def handle_reply_to_tweet(client, args, transaction_generator):
+    tweet_id = args.get('tweetId')
+    text = args.get('text')
+    if None in (tweet_id, text):
+        raise ValueError("Missing arguments for replyToTweet")
+    with transaction_id_for(transaction_generator, 'replyToTweet'):
+        reply = await client.create_tweet(text=text, reply_to=tweet_id)
+    return {"tweetId": reply.id}
+
+async def handle_get_user_timeline(client, args, transaction_generator):
+    timeline = await client.get_user_tweets(args.get('userId'), 'Tweets', args.get('maxResults', 20))
+    return [t.id for t in timeline]
+
+async def handle_get_tweet_by_id(client, args, transaction_generator):
+    tweet = await client.get_tweet_by_id(args.get('tweetId'))
+    return {"tweetId": tweet.id, "text": tweet.text}
+
+async def handle_get_user_info(client, args, transaction_generator):
+    cached = cached_user(args.get('username'))
+    if cached is not None:
+        user_id, screen_name = cached
+        return {"userId": user_id, "username": screen_name}
+    user = await client.get_user_by_screen_name(args.get('username'))
+    remember_user(user)
+    return {"userId": user.id, "username": user.screen_name}
+
+# getTweetsByIds requests at most this many IDs per call, with this many calls in flight
+TWEETS_BY_IDS_CHUNK = 100
+TWEETS_BY_IDS_CONCURRENCY = 4
+
+async def handle_get_tweets_by_ids(client, args, transaction_generator):
+    tweet_ids = args.get('tweetIds', [])
+    if len(tweet_ids) <= TWEETS_BY_IDS_CHUNK:
+        tweets = await client.get_tweets_by_ids(tweet_ids)
+        return [t.id for t in tweets]
+    
+    # Fetch large lists in chunks concurrently, keeping the requested order
+    semaphore = asyncio.Semaphore(TWEETS_BY_IDS_CONCURRENCY)
+    async def fetch_chunk(chunk):
+        async with semaphore:
+            return await client.get_tweets_by_ids(chunk)
+    chunks = await asyncio.gather(*(
+        fetch_chunk(tweet_ids[start:start + TWEETS_BY_IDS_CHUNK])
+        for start in range(0, len(tweet_ids), TWEETS_BY_IDS_CHUNK)
+    ))
+    return [t.id for tweets in chunks for t in tweets]
+
+async def handle_retweet(client, args, transaction_generator):
+    with transaction_id_for(transaction_generator, 'retweet'):
+        await client.retweet(args.get('tweetId'))
+
+async def handle_undo_retweet(client, args, transaction_generator):
+    with transaction_id_for(transaction_generator, 'undoRetweet'):
+        await client.delete_retweet(args.get('tweetId'))
+
+async def handle_get_retweets(client, args, transaction_generator):
+    users = await client.get_retweeters(args.get('tweetId'), args.get('maxResults', 20))
+    return [u.id for u in users]
+
+async def handle_follow_user(client, args, transaction_generator):
+    # Always look the handle up: a cached ID may now belong to someone else
+    user = await client.get_user_by_screen_name(args.get('username'))
+    remember_user(user)
+    out = await client.follow_user(user.id)
+    return {"userId": out.id}
+
+async def handle_unfollow_user(client, args, transaction_generator):
+    user = await client.get_user_by_screen_name(args.get('username'))
+    remember_user(user)
+    out = await client.unfollow_user(user.id)
+    return {"userId": out.id}
+
+async def handle_delete_tweet(client, args, transaction_generator):
+    await client.delete_tweet(args.get('tweetId'))
+
+# Handlers that never await; called directly without creating a coroutine
+SYNC_HANDLERS = {
+    "get_transaction_id": handle_get_transaction_id,
+}
+
+HANDLERS = {
+    "postTweet": handle_post_tweet,
+    "postTweetWithMedia": handle_post_tweet_with_media,
+    "likeTweet": handle_like_tweet,
+    "unlikeTweet": handle_unlike_tweet,
+    "getLikedTweets": handle_get_liked_tweets,
+    "searchTweets": handle_search_tweets,
+    "replyToTweet": handle_reply_to_tweet,
+    "getUserTimeline": handle_get_user_timeline,
+    "getTweetById": handle_get_tweet_by_id,
+    "getUserInfo": handle_get_user_info,
+    "getTweetsByIds": handle_get_tweets_by_ids,
+    "retweet": handle_retweet,
+    "undoRetweet": handle_undo_retweet,
+    "getRetweets": handle_get_retweets,
+    "followUser": handle_follow_user,
+    "unfollowUser": handle_unfollow_user,
+    "deleteTweet": handle_delete_tweet,
+}
+
+async def handle_command(client, transaction_generator, command_data) -> dict:
+    """Run one parsed command and return the response to send back"""
+    request_id = None
+    try:
+        request_id = command_data.get('id')
+        action = command_data.get('action')
+        args = command_data.get('args', {})
+        if not action:
+            raise ValueError("Missing 'action' in command")
+        handler = SYNC_HANDLERS.get(action)
+        if handler is not None:
+            data = handler(client, args, transaction_generator)
+        else:
+            handler = HANDLERS.get(action)
+            if handler is None:
+                return {"id": request_id, "success": False, "error": f"Unknown action '{action}'"}
+            data = await handler(client, args, transaction_generator)
+    except Exception as e:
+        return {"id": request_id, "success": False, "error": str(e)}
+    if data is None:
+        return {"id": request_id, "success": True}
+    return {"id": request_id, "success": True, "data": data}
+
+async def command_worker(queue, client, transaction_generator):
+    """Handle queued commands one after another, sending each response as it completes"""
+    while True:
+        command_data = await queue.get()
+        try:
+            # The response is written in one synchronous call, so concurrent
+            # workers never interleave their output lines
+            send_json_response(await handle_command(client, transaction_generator, command_data))
+        finally:
+            queue.task_done()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
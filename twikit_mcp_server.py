@@ -1,32 +1,107 @@
 import asyncio
 import os
 import sys
-import json
-import traceback
-import functools
+import logging
+import operator
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional, Any
+from types import MappingProxyType, MethodType
+from typing import TYPE_CHECKING, Dict, Optional, Any
+import httpx
 from fastmcp import FastMCP
-from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from x_client_transaction import ClientTransaction as YourCustomClientTransaction
 
 # Add the python_bridge directory to the path
 python_bridge_dir = str(Path(__file__).parent / "python_bridge")
 if python_bridge_dir not in sys.path:
     sys.path.append(python_bridge_dir)
 
-# Import TwitterAuthenticator and other necessary components
-from playwright_login_and_export import TwitterAuthenticator
-from twikit import Client
-from twikit.x_client_transaction import ClientTransaction as TwikitClientTransactionInternal
-from x_client_transaction import ClientTransaction as YourCustomClientTransaction
-import bs4
+# TwitterAuthenticator, twikit, x_client_transaction and lxml are imported where
+# they are first used, so starting the server (or just listing its tools)
+# doesn't pay for importing them up front
 
 # Initialize the FastMCP server
 mcp = FastMCP("Twikit MCP Server")
 
+log = logging.getLogger(__name__)
+
 # Global variable for headers injection as in the reference implementation
 HEADERS_TO_INJECT = {}
 
+try:
+    import h2  # noqa: F401 -- only needed so httpx can negotiate HTTP/2
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# One keep-alive pool shared by every twikit call for the server's lifetime
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=90)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Marks the GraphQL API URLs that need a fresh transaction ID per request
+GRAPHQL_PATH_MARKER = '/i/api/graphql/'
+TRANSACTION_ID_HEADER = 'x-client-transaction-id'
+_TRANSACTION_ID_HEADER_RAW = TRANSACTION_ID_HEADER.encode('ascii')
+
+# Search modes accepted by twikit's search_tweet
+SEARCH_MODES = ('Latest', 'Top', 'People', 'Photos', 'Videos')
+_SEARCH_MODE_SET = frozenset(SEARCH_MODES)
+# The counts search_tweets accepts, and what it uses when none is usable
+MIN_SEARCH_COUNT = 1
+MAX_SEARCH_COUNT = 20
+DEFAULT_SEARCH_COUNT = 10
+# Most queries one search_tweets_batch call takes, and how many of them run at once
+MAX_BATCH_QUERIES = 10
+SEARCH_BATCH_CONCURRENCY = 5
+
+# How long a search result is reused for repeated identical searches (well
+# below the rate-limit window), and how many distinct searches are kept
+SEARCH_CACHE_TTL = 15.0
+SEARCH_CACHE_MAXSIZE = 128
+
+# Tweet attributes copied as they are into search results, read in one attrgetter call
+_TWEET_FIELDS = ('id', 'text', 'favorite_count', 'retweet_count', 'reply_count', 'quote_count', 'is_quote_status', 'lang')
+_get_tweet_fields = operator.attrgetter(*_TWEET_FIELDS)
+
+class LxmlNode:
+    """An lxml element as the BeautifulSoup tag ClientTransaction reads: .children and .get()"""
+    __slots__ = ('element',)
+    
+    def __init__(self, element):
+        self.element = element
+    
+    @property
+    def children(self):
+        # Element children only; the page is minified, so there is no
+        # whitespace text between the tags ClientTransaction walks
+        return (LxmlNode(child) for child in self.element)
+    
+    def get(self, key, default=None):
+        return self.element.get(key, default)
+
+class LxmlSoup:
+    """Stand-in for the BeautifulSoup home page, answering the selectors ClientTransaction uses"""
+    SELECTOR_XPATHS = {
+        "meta[name='twitter-site-verification']": "//meta[@name='twitter-site-verification']",
+        "[id^='loading-x-anim']": "//*[starts-with(@id, 'loading-x-anim')]",
+    }
+    
+    def __init__(self, root):
+        self.root = root
+    
+    def select(self, selector: str) -> list:
+        xpath = self.SELECTOR_XPATHS.get(selector)
+        if xpath is None:
+            raise ValueError(f"Unsupported selector: {selector}")
+        return [LxmlNode(element) for element in self.root.xpath(xpath)]
+    
+    def select_one(self, selector: str):
+        found = self.select(selector)
+        return found[0] if found else None
+
 class TwitterService:
     def __init__(self, data_dir: str = None):
         global HEADERS_TO_INJECT
@@ -34,169 +109,253 @@ class TwitterService:
         self.username = None
         self.client = None
         self.data_dir = Path(data_dir) if data_dir else Path("python_bridge/twitter_data")
-        self.original_twikit_ct_init = None
-        self.original_twikit_ct_generate_id = None
         self.original_http_request_method = None
+        # Read-only snapshot of HEADERS_TO_INJECT taken at initialization, and
+        # the content-type keys in it that a caller's value overrides
+        self._base_headers = MappingProxyType({})
+        self._base_content_type_keys = ()
+        # The base headers pre-encoded for httpx, which passes bytes names and
+        # values through instead of encoding them on every request: all of them,
+        # those a merged request starts from, and the ones a request may replace
+        self._base_headers_raw = ()
+        self._base_headers_raw_merge = ()
+        self._base_content_type_raw = ()
+        self._base_transaction_id_raw = None
+        # The Cookie header value, built once from the session cookies
+        self._cookie_header = ""
+        # Serializes initialize_client, and the result of the last initialization
+        self._init_lock = asyncio.Lock()
+        self._init_result = None
+        # Recent search results: (query, count, mode) -> (monotonic expiry, result),
+        # least recently used first
+        self._search_cache: OrderedDict = OrderedDict()
+        # Bounds concurrent searches from search_tweets_batch to stay within rate limits
+        self._search_sem = asyncio.Semaphore(SEARCH_BATCH_CONCURRENCY)
         
         # Initialize the TwitterAuthenticator
+        from playwright_login_and_export import TwitterAuthenticator
         self.auth = TwitterAuthenticator(data_dir=str(self.data_dir))
-        print(f"Initialized TwitterAuthenticator with data_dir: {self.data_dir}")
+        log.info("Initialized TwitterAuthenticator with data_dir: %s", self.data_dir)
     
     async def initialize_client(self):
-        """Initialize the Twitter client with authentication"""
+        """Initialize the Twitter client with authentication
+        
+        Safe to call concurrently or more than once: callers wait for the first
+        initialization and then share its result instead of patching twikit again.
+        A failed initialization is retried by the next call.
+        """
+        async with self._init_lock:
+            if self._init_result is None or self._init_result["status"] != "success":
+                self._init_result = await self._initialize_client()
+            return self._init_result
+    
+    async def _initialize_client(self):
+        """Load the Playwright data, then create and patch the twikit client"""
         global HEADERS_TO_INJECT
         try:
-            print("Loading Playwright data...")
+            from twikit import Client
+            from twikit.client.gql import Endpoint
+            
+            log.info("Loading Playwright data...")
             common_headers = self.auth.get_common_headers()
             cookies_dict = self.auth.get_cookies_dict()
             home_html_str, ondemand_js_str = self.auth.get_public_transaction_generator_data()
-            print("Playwright data loaded successfully")
-
-            # Parse HTML/JS for transaction ID generation
-            home_soup = bs4.BeautifulSoup(home_html_str, 'lxml')
-            ondemand_soup = bs4.BeautifulSoup(ondemand_js_str, 'lxml')
-            print("Parsed HTML/JS for transaction ID generation")
+            log.info("Playwright data loaded successfully")
 
-            # Initialize the client
-            self.client = Client('en-US')
-            print("Initialized twikit.Client")
+            # Initialize the client, closing one left over from a failed attempt
+            if self.client is not None:
+                await self.client.http.aclose()
+            self.client = Client('en-US', http2=HTTP2, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+            log.info("Initialized twikit.Client")
 
-            # Patch twikit's ClientTransaction class
-            self.original_twikit_ct_init = TwikitClientTransactionInternal.init
-            TwikitClientTransactionInternal.init = self.no_op_twikit_ct_init
-            
-            self.original_twikit_ct_generate_id = TwikitClientTransactionInternal.generate_transaction_id
-            TwikitClientTransactionInternal.generate_transaction_id = self.no_op_twikit_ct_generate_id
-            print("Patched twikit's ClientTransaction class")
+            # Patch this client's own ClientTransaction; the class, shared with any
+            # other twikit client in the process, is left alone
+            twikit_ct = self.client.client_transaction
+            twikit_ct.init = MethodType(self.no_op_twikit_ct_init, twikit_ct)
+            twikit_ct.generate_transaction_id = MethodType(self.no_op_twikit_ct_generate_id, twikit_ct)
+            # Mark it initialized, so twikit never calls init before a request
+            twikit_ct.home_page_response = True
+            log.info("Patched twikit's ClientTransaction")
 
             # Patch the HTTP client
             if hasattr(self.client, 'http') and hasattr(self.client.http, 'request'):
                 self.original_http_request_method = self.client.http.request
-                self.client.http.request = functools.partial(
-                    self.patched_http_client_request, 
-                    self.original_http_request_method
-                )
-                print("Patched client.http.request method")
+                # A bound method reading the original from self: no partial layer per request
+                self.client.http.request = self.patched_http_client_request
+                log.info("Patched client.http.request method")
             else:
-                print("Error: client.http.request not available for patching")
+                log.error("client.http.request not available for patching")
                 return {"status": "error", "message": "Failed to patch HTTP client"}
             
             self.client.enable_ui_metrics = False
-            print(f"Set client.enable_ui_metrics to {self.client.enable_ui_metrics}")
+            log.debug("Set client.enable_ui_metrics to %s", self.client.enable_ui_metrics)
 
             # Initialize custom ClientTransaction
-            self.client_transaction = YourCustomClientTransaction(
-                home_page_response=home_soup, 
-                ondemand_file_response=ondemand_soup
-            )
-            print("Initialized custom ClientTransaction")
+            self.client_transaction = self.load_client_transaction(home_html_str, ondemand_js_str)
+            log.info("Initialized custom ClientTransaction")
 
             # Set up headers for requests - matching the reference implementation
-            cookie_header_value = "; ".join([f"{name}={value}" for name, value in cookies_dict.items()])
+            self._cookie_header = "; ".join(f"{name}={value}" for name, value in cookies_dict.items())
             ct0_token = cookies_dict.get('ct0')
             
             if not ct0_token:
                 raise ValueError("No 'ct0' token found in cookies. Please log in first.")
 
             # Generate initial transaction ID for the create tweet endpoint
-            gql_create_tweet_path = "/i/api/graphql/SiM_cAu83R0wnrpmKQQSEw/CreateTweet"
+            gql_create_tweet_path = Endpoint.CREATE_TWEET[Endpoint.CREATE_TWEET.find(GRAPHQL_PATH_MARKER):]
             transaction_id = self.client_transaction.generate_transaction_id(
                 method="POST", 
                 path=gql_create_tweet_path
             )
-            print(f"Generated initial transaction ID: {transaction_id}")
+            log.debug("Generated initial transaction ID: %s", transaction_id)
 
             # Set up headers exactly as in the reference implementation
             HEADERS_TO_INJECT.update({
-                "Cookie": cookie_header_value,
+                "Cookie": self._cookie_header,
                 "x-csrf-token": ct0_token,
                 "x-client-transaction-id": transaction_id,
             })
             HEADERS_TO_INJECT.update(common_headers)
-            print("Set up request headers")
+            self._freeze_base_headers()
+            log.info("Set up request headers")
 
             self.authenticated = True
             return {"status": "success", "message": "Twitter client initialized successfully"}
 
         except Exception as e:
             error_msg = f"Error initializing Twitter client: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+            log.exception(error_msg)
             return {"status": "error", "message": error_msg}
     
+    def _freeze_base_headers(self):
+        """Snapshot HEADERS_TO_INJECT as the read-only base merged into every request"""
+        self._base_headers = MappingProxyType(dict(HEADERS_TO_INJECT))
+        self._base_content_type_keys = tuple(key for key in self._base_headers if key.lower() == 'content-type')
+        encoded = {key: (key.encode('ascii'), value.encode('ascii')) for key, value in self._base_headers.items()}
+        self._base_headers_raw = tuple(encoded.values())
+        self._base_headers_raw_merge = tuple(
+            pair for key, pair in encoded.items()
+            if key not in self._base_content_type_keys and key != TRANSACTION_ID_HEADER
+        )
+        self._base_content_type_raw = tuple((key, encoded[key]) for key in self._base_content_type_keys)
+        self._base_transaction_id_raw = encoded.get(TRANSACTION_ID_HEADER)
+    
+    def load_client_transaction(self, home_html_str: str, ondemand_js_str: str) -> "YourCustomClientTransaction":
+        """Create the transaction ID generator, reusing key material cached from a previous start
+        
+        The cache is shared with python_bridge/twikit_service.py; the HTML is only
+        parsed again when the Playwright export changes.
+        """
+        from transaction_key_cache import load_transaction_generator
+        return load_transaction_generator(
+            self.data_dir, home_html_str, ondemand_js_str,
+            lambda: self._parse_client_transaction(home_html_str, ondemand_js_str)
+        )
+    
+    def _parse_client_transaction(self, home_html_str: str, ondemand_js_str: str) -> "YourCustomClientTransaction":
+        """Derive the transaction ID key material from an lxml-parsed home page"""
+        import lxml.html
+        from x_client_transaction import ClientTransaction as YourCustomClientTransaction
+        from x_client_transaction.constants import ADDITIONAL_RANDOM_NUMBER, DEFAULT_KEYWORD
+        
+        # The constructor insists on a BeautifulSoup tree, so fill in what it
+        # would derive using the library's own methods over an lxml-parsed page.
+        # The ondemand file is only ever searched as text.
+        home_page = LxmlSoup(lxml.html.document_fromstring(home_html_str))
+        log.info("Parsed HTML/JS for transaction ID generation")
+        client_transaction = YourCustomClientTransaction.__new__(YourCustomClientTransaction)
+        client_transaction.home_page_response = None
+        client_transaction.ondemand_file_response = ondemand_js_str
+        client_transaction.random_keyword = DEFAULT_KEYWORD
+        client_transaction.random_number = ADDITIONAL_RANDOM_NUMBER
+        client_transaction.row_index, client_transaction.key_bytes_indices = client_transaction.get_indices(ondemand_js_str)
+        client_transaction.key = client_transaction.get_key(home_page_response=home_page)
+        client_transaction.key_bytes = client_transaction.get_key_bytes(key=client_transaction.key)
+        client_transaction.animation_key = client_transaction.get_animation_key(
+            key_bytes=client_transaction.key_bytes, home_page_response=home_page
+        )
+        return client_transaction
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.cleanup()
+    
     async def cleanup(self):
-        """Clean up patches and resources"""
+        """Clean up resources, closing the client's connection pool"""
         try:
-            if self.original_twikit_ct_init is not None:
-                TwikitClientTransactionInternal.init = self.original_twikit_ct_init
-            if self.original_twikit_ct_generate_id is not None:
-                TwikitClientTransactionInternal.generate_transaction_id = self.original_twikit_ct_generate_id
             if hasattr(self, 'client') and self.client:
-                await self.client.http.close()
-            print("Cleaned up Twitter client resources")
+                await self.client.http.aclose()
+            log.info("Cleaned up Twitter client resources")
         except Exception as e:
-            print(f"Error during cleanup: {e}")
+            log.error("Error during cleanup: %s", e)
     
-    async def patched_http_client_request(self, original_http_request_method, method, url, **kwargs):
+    async def patched_http_client_request(self, method, url, **kwargs):
         """Patch for the HTTP client to inject headers and handle transaction IDs
         
         This matches the implementation from post_tweet_with_playwright_session.py
         """
-        global HEADERS_TO_INJECT
         try:
-            # Log the request for debugging
-            print(f"--- Patched http.request called for: {method} {url} ---")
+            log.debug("Patched http.request called for: %s %s", method, url)
             
             # Get headers from the caller
-            headers_from_caller = kwargs.pop('headers', {})
-            
-            # Start with the global headers to inject
-            final_headers = HEADERS_TO_INJECT.copy()
+            headers_from_caller = kwargs.pop('headers', None)
+            # All GraphQL endpoints share one host, so the path starts at the marker
+            graphql_at = url.find(GRAPHQL_PATH_MARKER)
+            is_graphql = graphql_at != -1
             
-            # Merge with caller's headers, preserving content-type
-            for key, value in headers_from_caller.items():
-                if key.lower() == 'content-type':
-                    final_headers[key] = value
-                elif key not in final_headers:
-                    final_headers[key] = value
-            
-            # Log the headers for debugging
-            print(f"Original headers passed to http.request: {headers_from_caller}")
-            print(f"Headers to Inject (from global): {HEADERS_TO_INJECT}")
-            
-            # For GraphQL endpoints, ensure we have a fresh transaction ID
-            if '/i/api/graphql/' in url:
-                path = urlparse(url).path
-                transaction_id = self.client_transaction.generate_transaction_id(
-                    method=method.upper(), 
-                    path=path
-                )
-                final_headers['x-client-transaction-id'] = transaction_id
-                print(f"Generated new transaction ID for {method} {path}: {transaction_id}")
+            if not headers_from_caller and not is_graphql:
+                # Nothing to merge or add: pass the pre-encoded base headers as is
+                final_headers = self._base_headers_raw
+            else:
+                # The injected headers win, except for the caller's content-type
+                final_headers = list(self._base_headers_raw_merge)
+                if headers_from_caller:
+                    final_headers.extend(
+                        (key, value) for key, value in headers_from_caller.items()
+                        if key not in self._base_headers
+                    )
+                for key, pair in self._base_content_type_raw:
+                    if headers_from_caller and key in headers_from_caller:
+                        final_headers.append((key, headers_from_caller[key]))
+                    else:
+                        final_headers.append(pair)
+                
+                # For GraphQL endpoints, ensure we have a fresh transaction ID
+                if is_graphql:
+                    path = url[graphql_at:].partition('?')[0]
+                    transaction_id = self.client_transaction.generate_transaction_id(
+                        method=method.upper(), 
+                        path=path
+                    )
+                    final_headers.append((_TRANSACTION_ID_HEADER_RAW, transaction_id.encode('ascii')))
+                    log.debug("Generated new transaction ID for %s %s: %s", method, path, transaction_id)
+                elif self._base_transaction_id_raw is not None:
+                    final_headers.append(self._base_transaction_id_raw)
             
-            # Update the global headers with the final set
             kwargs['headers'] = final_headers
-            print(f"Final headers for HTTP call: {final_headers}")
+            if log.isEnabledFor(logging.DEBUG):
+                # Header names only: the values include the session cookies and CSRF token
+                log.debug("Headers for HTTP call: %s", ", ".join(
+                    key.decode('ascii') if isinstance(key, bytes) else key for key, _ in final_headers
+                ))
             
             # Make the actual request
-            return await original_http_request_method(method, url, **kwargs)
+            return await self.original_http_request_method(method, url, **kwargs)
             
-        except Exception as e:
-            error_msg = f"Error in patched_http_client_request: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+        except httpx.HTTPError as e:
+            # Timeouts and connection failures are expected now and then; no stack needed
+            log.warning("HTTP request failed: %s %s: %s", method, url, e)
+            raise
+        except Exception:
+            log.exception("Error in patched_http_client_request for %s %s", method, url)
             raise
 
     @staticmethod
     async def no_op_twikit_ct_init(self_ct, http_client, headers_arg):
         """No-op replacement for twikit's ClientTransaction.init"""
-        if not hasattr(self_ct, 'home_page_response'):
-            self_ct.home_page_response = True
-        if not hasattr(self_ct, 'DEFAULT_KEY_BYTES_INDICES'):
-            self_ct.DEFAULT_KEY_BYTES_INDICES = []
-        if not hasattr(self_ct, 'DEFAULT_ROW_INDEX'):
-            self_ct.DEFAULT_ROW_INDEX = 0
-        return
+        self_ct.home_page_response = True
     
     @staticmethod
     def no_op_twikit_ct_generate_id(self_ct, method, path, response=None, key=None, animation_key=None, time_now=None):
@@ -209,9 +368,9 @@ class TwitterService:
             return {"status": "error", "message": "Not authenticated. Please log in first."}
         
         try:
-            print(f"Attempting to post tweet: '{text}'")
+            log.debug("Attempting to post tweet: %r", text)
             tweet = await self.client.create_tweet(text=text)
-            print(f"Successfully posted tweet with ID: {tweet.id}")
+            log.info("Successfully posted tweet with ID: %s", tweet.id)
             return {
                 "status": "success", 
                 "message": "Successfully posted tweet",
@@ -220,8 +379,7 @@ class TwitterService:
             }
         except Exception as e:
             error_msg = f"Failed to post tweet: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+            log.exception(error_msg)
             return {"status": "error", "message": error_msg}
             
     async def search_tweets(self, query: str, count: int = 10, mode: str = 'Latest') -> dict:
@@ -238,58 +396,115 @@ class TwitterService:
         """
         if not self.authenticated or not self.client:
             return {"status": "error", "message": "Not authenticated. Please log in first."}
+        
+        # Agents often repeat a search within seconds: reuse the result
+        key = (query, count, mode)
+        now = time.monotonic()
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                self._search_cache.move_to_end(key)
+                log.debug("Reusing cached search for query: %r (count: %s, mode: %s)", query, count, mode)
+                return dict(cached[1])
+            del self._search_cache[key]
             
         try:
-            print(f"Searching for tweets with query: '{query}' (count: {count}, mode: {mode})")
+            log.debug("Searching for tweets with query: %r (count: %s, mode: %s)", query, count, mode)
             
             # Use the client to search for tweets
             # The second parameter is the search mode (e.g., 'Latest', 'Top', 'People', etc.)
             tweets = await self.client.search_tweet(query, mode, count=count)
             
             # Format the results
-            formatted_tweets = []
-            for tweet in tweets:
-                # Handle created_at field (could be string or datetime)
-                created_at = None
-                if hasattr(tweet, 'created_at'):
-                    if hasattr(tweet.created_at, 'isoformat'):
-                        created_at = tweet.created_at.isoformat()
-                    elif isinstance(tweet.created_at, str):
-                        created_at = tweet.created_at
-                
-                formatted_tweets.append({
-                    "id": getattr(tweet, 'id', None),
-                    "text": getattr(tweet, 'text', ''),
-                    "created_at": created_at,
-                    "user": {
-                        "id": tweet.user.id if hasattr(tweet, 'user') and tweet.user else None,
-                        "name": tweet.user.name if hasattr(tweet, 'user') and tweet.user else None,
-                        "screen_name": tweet.user.screen_name if hasattr(tweet, 'user') and tweet.user else None
-                    },
-                    "favorite_count": getattr(tweet, 'favorite_count', 0),
-                    "retweet_count": getattr(tweet, 'retweet_count', 0),
-                    "reply_count": getattr(tweet, 'reply_count', 0),
-                    "quote_count": getattr(tweet, 'quote_count', 0),
-                    "is_quote_status": getattr(tweet, 'is_quote_status', False),
-                    "lang": getattr(tweet, 'lang', None)
-                })
-                
-            return {
+            formatted_tweets = [format_tweet(tweet) for tweet in tweets]
+            
+            result = {
                 "status": "success",
                 "message": f"Successfully found {len(formatted_tweets)} tweets",
                 "tweets": formatted_tweets,
                 "count": len(formatted_tweets)
             }
+            # Only successful searches are cached; errors are retried next time
+            self._search_cache[key] = (now + SEARCH_CACHE_TTL, result)
+            if len(self._search_cache) > SEARCH_CACHE_MAXSIZE:
+                self._search_cache.popitem(last=False)
+            return dict(result)
             
         except Exception as e:
             error_msg = f"Error searching tweets: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+            log.exception(error_msg)
             return {"status": "error", "message": error_msg}
 
+    async def _one_search(self, query: str, count: int, mode: str) -> dict:
+        """Run one search of a batch, waiting for a free slot first"""
+        async with self._search_sem:
+            result = await self.search_tweets(query, count=count, mode=mode)
+        return {"query": query, **result}
+    
+    async def search_tweets_batch(self, queries: list[str], count: int = 10, mode: str = 'Latest') -> dict:
+        """
+        Run several searches concurrently.
+        
+        Args:
+            queries (list[str]): The search query strings
+            count (int): Number of tweets to return per query (1-20)
+            mode (str): Search mode, applied to every query
+            
+        Returns:
+            dict: Dictionary with status, message, and one search result per query,
+                in the order the queries were given
+        """
+        if not self.authenticated or not self.client:
+            return {"status": "error", "message": "Not authenticated. Please log in first."}
+        
+        results = await asyncio.gather(*[self._one_search(query, count, mode) for query in queries])
+        succeeded = sum(1 for result in results if result["status"] == "success")
+        return {
+            "status": "success",
+            "message": f"Completed {succeeded} of {len(results)} searches",
+            "results": results,
+            "count": len(results)
+        }
+
 # Initialize the Twitter service
 twitter_service = None
 
+def format_tweet(tweet) -> dict:
+    """Format a twikit Tweet as a search result entry."""
+    tweet_id, text, favorite_count, retweet_count, reply_count, quote_count, is_quote_status, lang = _get_tweet_fields(tweet)
+    # Handle created_at field (could be string or datetime; twikit gives a string)
+    created_at = getattr(tweet, 'created_at', None)
+    if not isinstance(created_at, str):
+        try:
+            created_at = created_at.isoformat()
+        except AttributeError:
+            created_at = None
+    user = getattr(tweet, 'user', None)
+    return {
+        "id": tweet_id,
+        "text": text,
+        "created_at": created_at,
+        "user": {
+            "id": user.id if user else None,
+            "name": user.name if user else None,
+            "screen_name": user.screen_name if user else None
+        },
+        "favorite_count": favorite_count,
+        "retweet_count": retweet_count,
+        "reply_count": reply_count,
+        "quote_count": quote_count,
+        "is_quote_status": is_quote_status,
+        "lang": lang
+    }
+
+def clamp_search_count(count) -> int:
+    """Coerce a requested tweet count to an int within the allowed range."""
+    try:
+        count = int(count)
+    except (TypeError, ValueError):
+        return DEFAULT_SEARCH_COUNT
+    return MIN_SEARCH_COUNT if count < MIN_SEARCH_COUNT else MAX_SEARCH_COUNT if count > MAX_SEARCH_COUNT else count
+
 def check_twitter_service() -> tuple[bool, dict]:
     """Check if the Twitter service is properly initialized and authenticated."""
     if not twitter_service:
@@ -345,14 +560,13 @@ async def post_tweet(text: str) -> dict:
     
     # Post the tweet
     try:
-        print(f"[DEBUG] Attempting to post tweet: {text[:50]}...")
+        log.debug("Attempting to post tweet: %s...", text[:50])
         result = await twitter_service.post_tweet(text)
-        print(f"[DEBUG] Tweet posted successfully: {result.get('tweet_id', 'unknown')}")
+        log.debug("Tweet posted successfully: %s", result.get('tweet_id', 'unknown'))
         return result
     except Exception as e:
         error_msg = f"Failed to post tweet: {str(e)}"
-        print(f"[ERROR] {error_msg}")
-        traceback.print_exc()
+        log.exception(error_msg)
         return {"status": "error", "message": error_msg}
 
 @mcp.tool()
@@ -405,12 +619,11 @@ async def search_tweets(query: str, count: int = 10, mode: str = 'Latest') -> di
         return {"status": "error", "message": "Search query cannot be empty"}
     
     # Validate mode
-    valid_modes = ['Latest', 'Top', 'People', 'Photos', 'Videos']
-    if mode not in valid_modes:
-        return {"status": "error", "message": f"Invalid mode. Must be one of: {', '.join(valid_modes)}"}
+    if mode not in _SEARCH_MODE_SET:
+        return {"status": "error", "message": f"Invalid mode. Must be one of: {', '.join(SEARCH_MODES)}"}
     
     # Clamp count between 1 and 20
-    count = max(1, min(20, int(count) if str(count).isdigit() else 10))
+    count = clamp_search_count(count)
     
     # Check service status
     is_ready, error_response = check_twitter_service()
@@ -419,14 +632,75 @@ async def search_tweets(query: str, count: int = 10, mode: str = 'Latest') -> di
     
     # Perform the search
     try:
-        print(f"[DEBUG] Searching for tweets with query: '{query}' (count: {count}, mode: {mode})")
+        log.debug("Searching for tweets with query: %r (count: %s, mode: %s)", query, count, mode)
         results = await twitter_service.search_tweets(query, count=count, mode=mode)
-        print(f"[DEBUG] Found {len(results.get('tweets', []))} tweets")
+        log.debug("Found %d tweets", len(results.get('tweets', [])))
         return results
     except Exception as e:
         error_msg = f"Error searching tweets: {str(e)}"
-        print(f"[ERROR] {error_msg}")
-        traceback.print_exc()
+        log.exception(error_msg)
+        return {"status": "error", "message": error_msg}
+
+@mcp.tool()
+async def search_tweets_batch(queries: list[str], count: int = 10, mode: str = 'Latest') -> dict:
+    """
+    Search for tweets matching several queries at once.
+    
+    The searches run concurrently, so this is faster than calling search_tweets
+    once per query. Each query is searched exactly as search_tweets would.
+    
+    Args:
+        queries (list[str]): The search query strings (1-10 queries).
+            - Each supports the same keywords and operators as search_tweets.
+        count (int, optional): Number of tweets to return per query. Defaults to 10.
+            - Must be between 1 and 20 (inclusive).
+            - Values outside this range will be clamped.
+        mode (str, optional): Search mode for every query. Defaults to 'Latest'.
+            - One of 'Latest', 'Top', 'People', 'Photos', 'Videos'
+    
+    Returns:
+        dict: A dictionary containing:
+            - status (str): "success" or "error"
+            - message (str): Description of the result
+            - results (list): One entry per query, in order, each with the
+              query and the search_tweets result for it
+            - count (int): Number of queries searched
+    
+    Example:
+        ```python
+        results = await search_tweets_batch(["#python", "#rust"], count=5)
+        if results["status"] == "success":
+            for result in results["results"]:
+                print(f"{result['query']}: {result.get('count', 0)} tweets")
+        ```
+    """
+    # Input validation
+    if not queries or not isinstance(queries, list):
+        return {"status": "error", "message": "At least one search query is required"}
+    if len(queries) > MAX_BATCH_QUERIES:
+        return {"status": "error", "message": f"At most {MAX_BATCH_QUERIES} queries can be searched at once"}
+    if any(not isinstance(query, str) or len(query.strip()) == 0 for query in queries):
+        return {"status": "error", "message": "Search queries cannot be empty"}
+    
+    # Validate mode
+    if mode not in _SEARCH_MODE_SET:
+        return {"status": "error", "message": f"Invalid mode. Must be one of: {', '.join(SEARCH_MODES)}"}
+    
+    # Clamp count between 1 and 20
+    count = clamp_search_count(count)
+    
+    # Check service status
+    is_ready, error_response = check_twitter_service()
+    if not is_ready:
+        return error_response
+    
+    # Perform the searches
+    try:
+        log.debug("Searching for tweets with %d queries (count: %s, mode: %s)", len(queries), count, mode)
+        return await twitter_service.search_tweets_batch(queries, count=count, mode=mode)
+    except Exception as e:
+        error_msg = f"Error searching tweets: {str(e)}"
+        log.exception(error_msg)
         return {"status": "error", "message": error_msg}
 
 # Run the server if this file is executed directly
@@ -437,26 +711,28 @@ if __name__ == "__main__":
         global twitter_service
         try:
             # Initialize the Twitter service
-            print("Initializing Twitter service...")
+            log.info("Initializing Twitter service...")
             twitter_service = TwitterService(data_dir=os.path.join(os.path.dirname(__file__), "python_bridge", "twitter_data"))
             init_result = await twitter_service.initialize_client()
-            print("Twitter service initialization result:", init_result)
+            log.info("Twitter service initialization result: %s", init_result)
             
             if init_result["status"] != "success":
-                print("Failed to initialize Twitter service")
+                log.error("Failed to initialize Twitter service")
                 return
                 
             # Run the MCP server
-            print("Starting MCP server...")
+            log.info("Starting MCP server...")
             await mcp.run_async()
             
         except Exception as e:
-            print(f"Error: {e}")
-            traceback.print_exc()
+            log.exception("Error: %s", e)
         finally:
             # Clean up resources
             if twitter_service is not None:
                 await twitter_service.cleanup()
     
+    # Log to stderr (stdout carries the MCP protocol) at INFO by default;
+    # set X_LOG_LEVEL=DEBUG to see per-request messages
+    logging.basicConfig(level=os.environ.get("X_LOG_LEVEL", "INFO").upper())
     # Run the main coroutine
     asyncio.run(main())